@@ -2,7 +2,7 @@
 RISC-V CPU Core Components
 """
 
-from .instruction_decoder import InstructionDecoder, InstructionType, ExtensionType
+from .instruction_decoder import InstructionDecoder, InstructionType, ExtensionType, DecodedInstruction
 from .control_unit import ControlUnit, ControlSignals, ALUOperation
 from .register_file import RegisterFile
 from .memory_interface import MemoryInterface
@@ -10,7 +10,7 @@ from .integrated_alu import IntegratedALU
 from .single_cycle_datapath import SingleCycleDatapath
 
 __all__ = [
-    'InstructionDecoder', 'InstructionType', 'ExtensionType',
+    'InstructionDecoder', 'InstructionType', 'ExtensionType', 'DecodedInstruction',
     'ControlUnit', 'ControlSignals', 'ALUOperation',
     'RegisterFile', 'MemoryInterface', 'IntegratedALU',
     'SingleCycleDatapath'
@@ -4,9 +4,16 @@ Generates essential control signals for single-cycle CPU
 """
 
 from enum import Enum
-from typing import Dict, Any
-from dataclasses import dataclass
-from .instruction_decoder import InstructionDecoder, InstructionType, ExtensionType
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from .instruction_decoder import InstructionDecoder, InstructionType, ExtensionType, DecodedInstruction, DECODE_TABLE_SIZE
+
+
+DECODE_CACHE_SIZE = 65536  # Max distinct instruction words kept by decode_and_control
+
+# Compiled basic block: function applying the block to the register list and returning the next PC
+# as a byte offset from the block start, and the block's instruction count
+CompiledBlock = Tuple[Callable[[List[int]], int], int]
 
 
 class ALUOperation(Enum):
@@ -14,17 +21,62 @@ class ALUOperation(Enum):
     PASS_A, PASS_B = 13, 14  # For immediate operations
 
 
-@dataclass
-class ControlSignals:
-    reg_write: bool = False
-    alu_src_b: bool = False       # 0: reg, 1: immediate
-    mem_read: bool = False
-    mem_write: bool = False
-    branch: bool = False
-    jump: bool = False
-    mem_to_reg: bool = False
-    alu_op: ALUOperation = ALUOperation.ADD
-    pc_src: bool = False          # 0: PC+4, 1: branch/jump target
+# Packed control word layout: one flag per bit, ALU operation in bits 8-15
+REG_WRITE, ALU_SRC_B, MEM_READ, MEM_WRITE, BRANCH, JUMP, MEM_TO_REG, PC_SRC = (1 << i for i in range(8))
+ALU_OP_SHIFT, ALU_OP_MASK = 8, 0xFF
+_ALU_OPS = tuple(ALUOperation)  # Indexed by ALUOperation value
+
+
+class ControlSignals(int):
+    """
+    Control signals packed into a single int
+    Hot paths test bits directly (signals & MEM_READ); named properties decode the fields
+    """
+    __slots__ = ()
+    
+    def __new__(cls, reg_write: bool = False, alu_src_b: bool = False, mem_read: bool = False,
+                mem_write: bool = False, branch: bool = False, jump: bool = False, mem_to_reg: bool = False,
+                alu_op: ALUOperation = ALUOperation.ADD, pc_src: bool = False):
+        word = alu_op.value << ALU_OP_SHIFT
+        for flag, bit in ((reg_write, REG_WRITE), (alu_src_b, ALU_SRC_B), (mem_read, MEM_READ),
+                          (mem_write, MEM_WRITE), (branch, BRANCH), (jump, JUMP),
+                          (mem_to_reg, MEM_TO_REG), (pc_src, PC_SRC)):
+            if flag:
+                word |= bit
+        return super().__new__(cls, word)
+    
+    reg_write = property(lambda self: bool(self & REG_WRITE))
+    alu_src_b = property(lambda self: bool(self & ALU_SRC_B))     # 0: reg, 1: immediate
+    mem_read = property(lambda self: bool(self & MEM_READ))
+    mem_write = property(lambda self: bool(self & MEM_WRITE))
+    branch = property(lambda self: bool(self & BRANCH))
+    jump = property(lambda self: bool(self & JUMP))
+    mem_to_reg = property(lambda self: bool(self & MEM_TO_REG))
+    alu_op = property(lambda self: _ALU_OPS[(self >> ALU_OP_SHIFT) & ALU_OP_MASK])
+    pc_src = property(lambda self: bool(self & PC_SRC))           # 0: PC+4, 1: branch/jump target
+    
+    def __repr__(self) -> str:
+        return (f"ControlSignals(reg_write={self.reg_write}, alu_src_b={self.alu_src_b}, mem_read={self.mem_read}, "
+                f"mem_write={self.mem_write}, branch={self.branch}, jump={self.jump}, mem_to_reg={self.mem_to_reg}, "
+                f"alu_op={self.alu_op}, pc_src={self.pc_src})")
+
+
+# Native-int expression per ALU operation for compiled blocks; a and b are 32-bit words
+_BLOCK_EXPRESSIONS = {
+    ALUOperation.ADD: "({a} + {b}) & 0xFFFFFFFF", ALUOperation.SUB: "({a} - {b}) & 0xFFFFFFFF",
+    ALUOperation.AND: "{a} & {b}", ALUOperation.OR: "{a} | {b}", ALUOperation.XOR: "{a} ^ {b}",
+    ALUOperation.SLL: "({a} << ({b} & 0x1F)) & 0xFFFFFFFF", ALUOperation.SRL: "{a} >> ({b} & 0x1F)",
+    ALUOperation.SRA: "((({a} ^ 0x80000000) - 0x80000000) >> ({b} & 0x1F)) & 0xFFFFFFFF",
+    ALUOperation.SLT: "int(({a} ^ 0x80000000) < ({b} ^ 0x80000000))", ALUOperation.SLTU: "int({a} < {b})",
+    ALUOperation.MUL: "({a} * {b}) & 0xFFFFFFFF", ALUOperation.PASS_A: "{a}", ALUOperation.PASS_B: "{b}",
+}
+
+# Taken condition of each conditional branch, over register words {a} and {b}
+_BRANCH_CONDITIONS = {
+    "BEQ": "{a} == {b}", "BNE": "{a} != {b}",
+    "BLT": "({a} ^ 0x80000000) < ({b} ^ 0x80000000)", "BGE": "({a} ^ 0x80000000) >= ({b} ^ 0x80000000)",
+    "BLTU": "{a} < {b}", "BGEU": "{a} >= {b}",
+}
 
 
 class ControlUnit:
@@ -49,37 +101,108 @@ class ControlUnit:
             self.alu_map[op] = ALUOperation.ADD  # Address calculation
         for op in ["BEQ", "BNE", "BLT", "BGE", "BLTU", "BGEU"]:
             self.alu_map[op] = ALUOperation.SUB  # Compare via subtraction
-    
-    def generate_control_signals(self, decoded_instruction: Dict[str, Any]) -> ControlSignals:
-        signals = ControlSignals()
-        op = decoded_instruction['operation']
-        inst_type = decoded_instruction['instruction_type']
         
-        if op == "ILLEGAL":
-            return signals
+        # Control signals are a pure function of (operation, instruction_type): build each once and share it
+        self._default_signals = ControlSignals()
+        self._signals_by_op: Dict[tuple[str, InstructionType], ControlSignals] = {}
         
-        # ALU operation
-        signals.alu_op = self.alu_map.get(op, ALUOperation.ADD)
+        # Same signals as a dense list indexed by the decoder's key (opcode << 10) | (func3 << 7) | func7
+        illegal = self.decoder._illegal
+        self._control_table: List[ControlSignals] = [self._default_signals] * DECODE_TABLE_SIZE
+        for table_key, info in enumerate(self.decoder._decode_table):
+            if info is not illegal:
+                self._control_table[table_key] = self.generate_control_signals(info)
         
-        # Register write
-        signals.reg_write = inst_type != InstructionType.S_TYPE and inst_type != InstructionType.B_TYPE and op not in ["SW", "SB", "SH", "FSW"]
+        # Decoded instruction + control signals keyed by raw instruction word, least recently used evicted first
+        self._decode_cached = lru_cache(maxsize=DECODE_CACHE_SIZE)(self._decode_uncached)
+        
+        # Compiled basic blocks keyed by the instruction words they were built from
+        self._block_cache: Dict[Tuple[int, ...], Optional[CompiledBlock]] = {}
+    
+    def generate_control_signals(self, decoded_instruction: DecodedInstruction) -> ControlSignals:
+        key = (decoded_instruction.operation, decoded_instruction.instruction_type)
+        signals = self._signals_by_op.get(key)
+        if signals is None:
+            signals = self._signals_by_op[key] = self._compute_control_signals(*key)
+        return signals
+    
+    def _compute_control_signals(self, op: str, inst_type: InstructionType) -> ControlSignals:
+        if op == "ILLEGAL":
+            return self._default_signals
         
-        # ALU source B (0: register, 1: immediate)
-        signals.alu_src_b = inst_type in [InstructionType.I_TYPE, InstructionType.S_TYPE, InstructionType.U_TYPE, InstructionType.J_TYPE]
+        # Register write
+        reg_write = inst_type != InstructionType.S_TYPE and inst_type != InstructionType.B_TYPE and op not in ["SW", "SB", "SH", "FSW"]
         
         # Memory operations
-        signals.mem_read = op in ["LB", "LH", "LW", "LBU", "LHU", "FLW"]
-        signals.mem_write = op in ["SB", "SH", "SW", "FSW"]
-        signals.mem_to_reg = signals.mem_read
+        mem_read = op in ["LB", "LH", "LW", "LBU", "LHU", "FLW"]
         
         # Branch and jump
-        signals.branch = inst_type == InstructionType.B_TYPE
-        signals.jump = op in ["JAL", "JALR"]
-        signals.pc_src = signals.branch or signals.jump
+        branch = inst_type == InstructionType.B_TYPE
+        jump = op in ["JAL", "JALR"]
         
-        return signals
+        return ControlSignals(
+            reg_write=reg_write,
+            # ALU source B (0: register, 1: immediate)
+            alu_src_b=inst_type in [InstructionType.I_TYPE, InstructionType.S_TYPE, InstructionType.U_TYPE, InstructionType.J_TYPE],
+            mem_read=mem_read,
+            mem_write=op in ["SB", "SH", "SW", "FSW"],
+            branch=branch,
+            jump=jump,
+            mem_to_reg=mem_read,
+            alu_op=self.alu_map.get(op, ALUOperation.ADD),
+            pc_src=branch or jump,
+        )
+    
+    def decode_and_control(self, instruction: int) -> tuple[DecodedInstruction, ControlSignals]:
+        # Loops re-execute the same words, so decode + control is usually one cache hit
+        return self._decode_cached(instruction & 0xFFFFFFFF)
     
-    def decode_and_control(self, instruction: int) -> tuple[Dict[str, Any], ControlSignals]:
+    def _decode_uncached(self, instruction: int) -> tuple[DecodedInstruction, ControlSignals]:
         decoded = self.decoder.decode(instruction)
-        control = self.generate_control_signals(decoded)
-        return decoded, control
\ No newline at end of file
+        control = self._control_table[(decoded.opcode << 10) | (decoded.func3 << 7) | decoded.func7]
+        return decoded, control
+    
+    def compile_block(self, words: Sequence[int]) -> Optional[CompiledBlock]:
+        """
+        Compile the leading run of register-only ALU instructions in words into one Python function
+        A conditional branch directly after the run is compiled in as the block's last instruction.
+        The function takes the register list (32 words), applies the whole run with native int ops
+        and returns the next PC as a byte offset from the block start.
+        Returns (function, instruction count), or None if the first instruction is not compilable
+        """
+        key = tuple(words)
+        if key in self._block_cache:
+            return self._block_cache[key]
+        
+        lines, count, ends_in_branch = [], 0, False
+        for word in key:
+            decoded, control = self.decode_and_control(word)
+            condition = _BRANCH_CONDITIONS.get(decoded.operation)
+            if condition is not None and control & BRANCH:
+                # Like execute_cycle, a branch always drives the PC: taken jumps, not taken stays put
+                here = 4 * count
+                condition = condition.format(a=f"r[{decoded.rs1}]", b=f"r[{decoded.rs2}]")
+                lines.append(f"    return {here + decoded.immediate} if {condition} else {here}")
+                count, ends_in_branch = count + 1, True
+                break
+            template = _BLOCK_EXPRESSIONS.get(control.alu_op)
+            # Stop at anything that touches memory or the PC, or whose result is not written back
+            if (template is None or not control & REG_WRITE or control & (MEM_READ | MEM_WRITE | BRANCH | JUMP)
+                    or decoded.operation.startswith('B')):
+                break
+            count += 1
+            if decoded.rd == 0:
+                continue  # x0 writes are discarded
+            operand_b = str(decoded.immediate & 0xFFFFFFFF) if control & ALU_SRC_B else f"r[{decoded.rs2}]"
+            lines.append(f"    r[{decoded.rd}] = {template.format(a=f'r[{decoded.rs1}]', b=operand_b)}")
+        
+        block = None
+        if count:
+            if not ends_in_branch:
+                lines.append(f"    return {4 * count}")
+            source = "def block(r):\n" + "\n".join(lines) + "\n"
+            namespace: Dict[str, Callable[[List[int]], int]] = {}
+            exec(compile(source, f"<block {key[0]:#010x}+{count}>", "exec"), namespace)
+            block = (namespace["block"], count)
+        self._block_cache[key] = block
+        return block
@@ -3,9 +3,48 @@ RISC-V Instruction Decoder - Minimal Implementation
 Supports RV32I + M + F extensions with essential functionality
 """
 
-import struct
+from array import array
 from enum import Enum
-from typing import Dict, Any
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, NamedTuple, Optional
+
+
+# Access width and signedness indexed by func3 (0 width marks an illegal encoding)
+_LOAD_WIDTH = (8, 16, 32, 0, 8, 16, 0, 0)
+_LOAD_SIGNED = (1, 1, 1, 0, 0, 0, 0, 0)
+_STORE_WIDTH = (8, 16, 32, 0, 0, 0, 0, 0)
+
+# Decode table size: one entry per (opcode << 10) | (func3 << 7) | func7 for every 7-bit opcode
+DECODE_TABLE_SIZE = 1 << 17
+
+
+# Immediate decoders, one per format: gather the immediate bits of a 32-bit word with shifts and masks,
+# then sign extend branch-free as (value ^ sign_bit) - sign_bit
+def _imm_i_type(instruction: int) -> int:
+    return ((instruction >> 20) ^ 0x800) - 0x800
+
+
+def _imm_s_type(instruction: int) -> int:
+    return ((((instruction >> 20) & 0xFE0) | ((instruction >> 7) & 0x1F)) ^ 0x800) - 0x800
+
+
+def _imm_b_type(instruction: int) -> int:
+    return ((((instruction >> 19) & 0x1000) | ((instruction << 4) & 0x800) | ((instruction >> 20) & 0x7E0) |
+             ((instruction >> 7) & 0x1E)) ^ 0x1000) - 0x1000
+
+
+def _imm_u_type(instruction: int) -> int:
+    return instruction & 0xFFFFF000
+
+
+def _imm_j_type(instruction: int) -> int:
+    return ((((instruction >> 11) & 0x100000) | (instruction & 0xFF000) | ((instruction >> 9) & 0x800) |
+             ((instruction >> 20) & 0x7FE)) ^ 0x100000) - 0x100000
+
+
+def _imm_none(instruction: int) -> int:
+    """Immediate of a format without one (R-type, unknown opcodes), for decode_batch"""
+    return 0
 
 
 class InstructionType(Enum):
@@ -16,6 +55,66 @@ class ExtensionType(Enum):
     BASE, M_EXTENSION, F_EXTENSION = "RV32I", "M", "F"
 
 
+class OpInfo(NamedTuple):
+    """Decode fields that depend only on (opcode, func3, func7); shared by every matching instruction"""
+    operation: str
+    instruction_type: InstructionType = InstructionType.R_TYPE
+    extension: ExtensionType = ExtensionType.BASE
+    operand_width: int = 32
+    signed_operation: bool = True
+    memory_operation: bool = False
+    float_operation: bool = False
+    branch_operation: bool = False
+    jump_operation: bool = False
+    imm_decoder: Optional[Callable[[int], int]] = None
+
+
+@dataclass(slots=True, frozen=True)
+class DecodedInstruction:
+    """Register fields and immediate of one instruction plus its shared OpInfo (immutable: decodes are cached and shared)"""
+    raw_instruction: int
+    opcode: int
+    rd: int
+    rs1: int
+    rs2: int
+    func3: int
+    func7: int
+    immediate: int
+    immediate_word: int  # immediate as an unsigned 32-bit two's complement word (ALU operand B)
+    info: OpInfo
+
+    operation = property(lambda self: self.info.operation)
+    instruction_type = property(lambda self: self.info.instruction_type)
+    extension = property(lambda self: self.info.extension)
+    operand_width = property(lambda self: self.info.operand_width)
+    signed_operation = property(lambda self: self.info.signed_operation)
+    memory_operation = property(lambda self: self.info.memory_operation)
+    float_operation = property(lambda self: self.info.float_operation)
+    branch_operation = property(lambda self: self.info.branch_operation)
+    jump_operation = property(lambda self: self.info.jump_operation)
+
+    # Mapping-style access kept for callers written against the old dict result
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+
+class DecodedBatch(NamedTuple):
+    """Structure-of-arrays decode of an instruction stream, one array per field"""
+    opcode: array
+    rd: array
+    func3: array
+    rs1: array
+    rs2: array
+    func7: array
+    immediate: array
+
+
 class InstructionDecoder:
     def __init__(self):
         self.OPCODES = {
@@ -34,115 +133,132 @@ class InstructionDecoder:
         self.LOAD_OPS = {0b000: "LB", 0b001: "LH", 0b010: "LW", 0b100: "LBU", 0b101: "LHU"}
         self.STORE_OPS = {0b000: "SB", 0b001: "SH", 0b010: "SW"}
         self.BRANCH_OPS = {0b000: "BEQ", 0b001: "BNE", 0b100: "BLT", 0b101: "BGE", 0b110: "BLTU", 0b111: "BGEU"}
-    
-    def decode(self, instruction: int) -> Dict[str, Any]:
-        instruction &= 0xFFFFFFFF
-        opcode, rd, func3, rs1, rs2, func7 = (instruction & 0x7F, (instruction >> 7) & 0x1F,
-                                              (instruction >> 12) & 0x7, (instruction >> 15) & 0x1F,
-                                              (instruction >> 20) & 0x1F, (instruction >> 25) & 0x7F)
         
-        inst_info = {'raw_instruction': instruction, 'opcode': opcode, 'rd': rd, 'rs1': rs1, 'rs2': rs2,
-                     'func3': func3, 'func7': func7, 'immediate': 0, 'instruction_type': InstructionType.R_TYPE,
-                     'operation': "UNKNOWN", 'extension': ExtensionType.BASE, 'operand_width': 32,
-                     'signed_operation': True, 'memory_operation': False, 'float_operation': False,
-                     'branch_operation': False, 'jump_operation': False}
+        self._illegal = OpInfo("ILLEGAL")
+        self._decode_table = self._build_decode_table()
         
-        if opcode not in self.OPCODES:
-            inst_info['operation'] = "ILLEGAL"
-            return inst_info
-        
-        inst_format, operation_type = self.OPCODES[opcode]
-        inst_info['instruction_type'] = InstructionType[inst_format]
-        
-        if inst_format == "R_TYPE" and operation_type == "ALU":
-            return self._decode_r_type(instruction, inst_info)
-        elif inst_format == "I_TYPE":
-            return self._decode_i_type(instruction, inst_info, operation_type)
-        elif inst_format == "S_TYPE":
-            return self._decode_s_type(instruction, inst_info)
-        elif inst_format == "B_TYPE":
-            return self._decode_b_type(instruction, inst_info)
-        elif inst_format == "U_TYPE":
-            return self._decode_u_type(instruction, inst_info, operation_type)
-        elif inst_format == "J_TYPE":
-            return self._decode_j_type(instruction, inst_info)
-        
-        return inst_info
+        # Immediate decoder per 7-bit opcode (_imm_none where the format has no immediate), for decode_batch
+        self._imm_decoders = [_imm_none] * 128
+        for opcode in self.OPCODES:
+            self._imm_decoders[opcode] = self._decode_table[opcode << 10].imm_decoder or _imm_none
+    
+    def _build_decode_table(self):
+        """
+        Pre-decode every (opcode, func3, func7) into a list indexed by (opcode << 10) | (func3 << 7) | func7
+        Unknown opcodes keep the shared ILLEGAL entry
+        """
+        table = [self._illegal] * DECODE_TABLE_SIZE
+        for opcode, (inst_format, op_type) in self.OPCODES.items():
+            for func3 in range(8):
+                # func7 only selects the operation for R-type ALU ops and SRLI/SRAI
+                uses_func7 = op_type == "ALU" or (op_type == "ALU_IMM" and func3 == 0b101)
+                for func7 in range(128):
+                    if func7 and not uses_func7:
+                        pass  # func7 bits belong to the immediate; reuse the func7 == 0 entry
+                    elif inst_format == "R_TYPE" and op_type == "ALU":
+                        info = self._decode_r_type(func3, func7)
+                    elif inst_format == "I_TYPE":
+                        info = self._decode_i_type(func3, func7, op_type)
+                    elif inst_format == "S_TYPE":
+                        info = self._decode_s_type(func3)
+                    elif inst_format == "B_TYPE":
+                        info = self._decode_b_type(func3)
+                    elif inst_format == "U_TYPE":
+                        info = self._decode_u_type(op_type)
+                    elif inst_format == "J_TYPE":
+                        info = self._decode_j_type()
+                    else:
+                        info = OpInfo("UNKNOWN", InstructionType[inst_format])
+                    table[(opcode << 10) | (func3 << 7) | func7] = info
+        return table
     
-    def _decode_r_type(self, instruction, inst_info):
-        func3, func7 = inst_info['func3'], inst_info['func7']
-        if func7 == 0x01:
-            inst_info['extension'] = ExtensionType.M_EXTENSION
+    def decode(self, instruction: int) -> DecodedInstruction:
+        instruction &= 0xFFFFFFFF
+        # Table key (opcode << 10) | (func3 << 7) | func7 straight from the word, no intermediate fields
+        info = self._decode_table[((instruction & 0x7F) << 10) | ((instruction >> 5) & 0x380) | (instruction >> 25)]
+        imm_decoder = info.imm_decoder
+        immediate = imm_decoder(instruction) if imm_decoder else 0
+        return DecodedInstruction(instruction, instruction & 0x7F, (instruction >> 7) & 0x1F,
+                                  (instruction >> 15) & 0x1F, (instruction >> 20) & 0x1F,
+                                  (instruction >> 12) & 0x7, instruction >> 25,
+                                  immediate, immediate & 0xFFFFFFFF, info)
+    
+    def decode_batch(self, words: Iterable[int]) -> DecodedBatch:
+        """
+        Decode a whole trace or basic block at once into a DecodedBatch
+        Each field is extracted across all words in one pass; immediates come from the decode table
+        """
+        # A list, not an array: each field pass then reuses the int objects instead of boxing them again
+        words = [word & 0xFFFFFFFF for word in words]
+        imm_decoders = self._imm_decoders
+        # Every opcode has a decoder, so the immediates are one comprehension with no per-word branch
+        immediate = array('q', [imm_decoders[word & 0x7F](word) for word in words])
         
-        inst_info['operation'] = self.R_OPS.get((func3, func7), "ILLEGAL")
-        return inst_info
+        return DecodedBatch(array('B', [word & 0x7F for word in words]),
+                            array('B', [(word >> 7) & 0x1F for word in words]),
+                            array('B', [(word >> 12) & 0x7 for word in words]),
+                            array('B', [(word >> 15) & 0x1F for word in words]),
+                            array('B', [(word >> 20) & 0x1F for word in words]),
+                            array('B', [word >> 25 for word in words]),
+                            immediate)
     
-    def _decode_i_type(self, instruction, inst_info, op_type):
-        inst_info['immediate'] = self._sign_extend((instruction >> 20) & 0xFFF, 12)
+    def _decode_r_type(self, func3, func7):
+        extension = ExtensionType.M_EXTENSION if func7 == 0x01 else ExtensionType.BASE
+        return OpInfo(self.R_OPS.get((func3, func7), "ILLEGAL"), InstructionType.R_TYPE, extension)
+    
+    def _decode_i_type(self, func3, func7, op_type):
+        fields = dict(instruction_type=InstructionType.I_TYPE, imm_decoder=_imm_i_type)
         
         if op_type == "LOAD":
-            inst_info['memory_operation'] = True
-            inst_info['operation'] = self.LOAD_OPS.get(inst_info['func3'], "ILLEGAL")
-            inst_info['operand_width'] = [8, 16, 32][inst_info['func3'] & 3] if inst_info['func3'] < 3 else [8, 16][inst_info['func3'] - 4]
-            inst_info['signed_operation'] = inst_info['func3'] < 4
+            fields['memory_operation'] = True
+            operation = self.LOAD_OPS.get(func3, "ILLEGAL")
+            fields['operand_width'] = _LOAD_WIDTH[func3]
+            fields['signed_operation'] = bool(_LOAD_SIGNED[func3])
         elif op_type == "ALU_IMM":
-            inst_info['operation'] = self.I_OPS.get(inst_info['func3'], "ILLEGAL")
-            if inst_info['func3'] == 0b001:
-                inst_info['operation'] = "SLLI"
-            elif inst_info['func3'] == 0b101:
-                inst_info['operation'] = "SRLI" if inst_info['func7'] == 0x00 else "SRAI"
+            operation = self.I_OPS.get(func3, "ILLEGAL")
+            if func3 == 0b001:
+                operation = "SLLI"
+            elif func3 == 0b101:
+                operation = "SRLI" if func7 == 0x00 else "SRAI"
         elif op_type == "JALR":
-            inst_info['operation'] = "JALR"
-            inst_info['jump_operation'] = True
-        elif op_type == "FP_LOAD":
-            inst_info['extension'] = ExtensionType.F_EXTENSION
-            inst_info['float_operation'] = True
-            inst_info['memory_operation'] = True
-            inst_info['operation'] = "FLW" if inst_info['func3'] == 0b010 else "ILLEGAL"
+            operation = "JALR"
+            fields['jump_operation'] = True
+        else:  # FP_LOAD
+            fields['extension'] = ExtensionType.F_EXTENSION
+            fields['float_operation'] = True
+            fields['memory_operation'] = True
+            operation = "FLW" if func3 == 0b010 else "ILLEGAL"
         
-        return inst_info
-    
-    def _decode_s_type(self, instruction, inst_info):
-        inst_info['immediate'] = self._sign_extend(((instruction >> 25) << 5) | ((instruction >> 7) & 0x1F), 12)
-        inst_info['memory_operation'] = True
-        inst_info['operation'] = self.STORE_OPS.get(inst_info['func3'], "ILLEGAL")
-        inst_info['operand_width'] = [8, 16, 32][inst_info['func3']]
-        return inst_info
+        return OpInfo(operation, **fields)
     
-    def _decode_b_type(self, instruction, inst_info):
-        inst_info['immediate'] = self._sign_extend(((instruction >> 31) << 12) | (((instruction >> 7) & 1) << 11) |
-                                                  (((instruction >> 25) & 0x3F) << 5) | (((instruction >> 8) & 0xF) << 1), 13)
-        inst_info['branch_operation'] = True
-        inst_info['operation'] = self.BRANCH_OPS.get(inst_info['func3'], "ILLEGAL")
-        return inst_info
+    def _decode_s_type(self, func3):
+        operation = self.STORE_OPS.get(func3, "ILLEGAL")
+        return OpInfo(operation, InstructionType.S_TYPE, operand_width=_STORE_WIDTH[func3], memory_operation=True,
+                      imm_decoder=_imm_s_type)
     
-    def _decode_u_type(self, instruction, inst_info, op_type):
-        inst_info['immediate'] = instruction & 0xFFFFF000
-        inst_info['operation'] = op_type
-        return inst_info
+    def _decode_b_type(self, func3):
+        return OpInfo(self.BRANCH_OPS.get(func3, "ILLEGAL"), InstructionType.B_TYPE, branch_operation=True,
+                      imm_decoder=_imm_b_type)
     
-    def _decode_j_type(self, instruction, inst_info):
-        inst_info['immediate'] = self._sign_extend(((instruction >> 31) << 20) | (((instruction >> 12) & 0xFF) << 12) |
-                                                  (((instruction >> 20) & 1) << 11) | (((instruction >> 21) & 0x3FF) << 1), 21)
-        inst_info['operation'] = "JAL"
-        inst_info['jump_operation'] = True
-        return inst_info
+    def _decode_u_type(self, op_type):
+        return OpInfo(op_type, InstructionType.U_TYPE, imm_decoder=_imm_u_type)
     
-    def _sign_extend(self, value, bits):
-        return value - (1 << bits) if value & (1 << (bits - 1)) else value
+    def _decode_j_type(self):
+        return OpInfo("JAL", InstructionType.J_TYPE, jump_operation=True, imm_decoder=_imm_j_type)
     
-    def format_instruction(self, inst_info):
-        op, rd, rs1, rs2, imm = inst_info['operation'], f"x{inst_info['rd']}", f"x{inst_info['rs1']}", f"x{inst_info['rs2']}", inst_info['immediate']
+    def format_instruction(self, inst_info: DecodedInstruction) -> str:
+        op, rd, rs1, rs2, imm = inst_info.operation, f"x{inst_info.rd}", f"x{inst_info.rs1}", f"x{inst_info.rs2}", inst_info.immediate
+        inst_type = inst_info.instruction_type
         
-        if inst_info['instruction_type'] == InstructionType.R_TYPE:
+        if inst_type == InstructionType.R_TYPE:
             return f"{op} {rd}, {rs1}, {rs2}"
-        elif inst_info['instruction_type'] == InstructionType.I_TYPE:
-            return f"{op} {rd}, {imm}({rs1})" if inst_info['memory_operation'] else f"{op} {rd}, {rs1}, {imm}"
-        elif inst_info['instruction_type'] == InstructionType.S_TYPE:
+        elif inst_type == InstructionType.I_TYPE:
+            return f"{op} {rd}, {imm}({rs1})" if inst_info.memory_operation else f"{op} {rd}, {rs1}, {imm}"
+        elif inst_type == InstructionType.S_TYPE:
             return f"{op} {rs2}, {imm}({rs1})"
-        elif inst_info['instruction_type'] in [InstructionType.B_TYPE, InstructionType.J_TYPE]:
-            return f"{op} {rs1}, {rs2}, {imm}" if inst_info['instruction_type'] == InstructionType.B_TYPE else f"{op} {rd}, {imm}"
-        elif inst_info['instruction_type'] == InstructionType.U_TYPE:
+        elif inst_type in [InstructionType.B_TYPE, InstructionType.J_TYPE]:
+            return f"{op} {rs1}, {rs2}, {imm}" if inst_type == InstructionType.B_TYPE else f"{op} {rd}, {imm}"
+        elif inst_type == InstructionType.U_TYPE:
             return f"{op} {rd}, {imm >> 12}"
         
-        return f"UNKNOWN: 0x{inst_info['raw_instruction']:08X}"
\ No newline at end of file
+        return f"UNKNOWN: 0x{inst_info.raw_instruction:08X}"
\ No newline at end of file
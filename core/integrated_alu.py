@@ -1,212 +1,210 @@
 """
 RISC-V ALU Integration
-Uses utils utilities for all arithmetic operations
+Computes on native 32-bit Python ints (unsigned, masked to 0xFFFFFFFF)
 Provides unified interface for single-cycle CPU datapath
 """
 
-from typing import Dict, Tuple, Optional
-from utils import Bits, zero_bits, left_pad, alu, mdu_mul, mdu_div, shifter
+import operator
+from typing import NamedTuple, Tuple
+from utils import Bits, Word, WORD_MASK, bits_to_word, word_to_bits, word_to_signed
 from .control_unit import ALUOperation
 
 
+class ALUFlags(NamedTuple):
+    """Condition flags produced by an ALU operation"""
+    N: int  # Negative: result MSB
+    Z: int  # Zero: result == 0
+    C: int  # Carry out of bit 31 (ADD/SUB only)
+    V: int  # Signed overflow (ADD/SUB/DIV only)
+
+
+# Every flag combination built once, indexed by N<<3 | Z<<2 | C<<1 | V
+_FLAGS = tuple(ALUFlags((i >> 3) & 1, (i >> 2) & 1, (i >> 1) & 1, i & 1) for i in range(16))
+
+
+# Branch op -> (comparison, bias). XOR-ing both words with the sign bit maps signed
+# order onto unsigned order, so BLT/BGE compare the same way as BLTU/BGEU.
+_BRANCH_COMPARE = {
+    "BEQ": (operator.eq, 0), "BNE": (operator.ne, 0),
+    "BLT": (operator.lt, 0x80000000), "BGE": (operator.ge, 0x80000000),
+    "BLTU": (operator.lt, 0), "BGEU": (operator.ge, 0),
+}
+
+
 class IntegratedALU:
     """
-    Integrated ALU using utils utilities
+    Integrated ALU operating on 32-bit words
     Supports RV32I base + M extension operations
     """
-    
+
     def __init__(self):
-        pass
-    
-    def execute(self, operation: ALUOperation, operand_a: Bits, operand_b: Bits) -> Tuple[Bits, Dict[str, int]]:
+        # One handler per operation, each returning (result, flags)
+        self._dispatch = {
+            ALUOperation.ADD: self._op_add, ALUOperation.SUB: self._op_sub,
+            ALUOperation.AND: self._op_and, ALUOperation.OR: self._op_or, ALUOperation.XOR: self._op_xor,
+            ALUOperation.SLL: self._op_sll, ALUOperation.SRL: self._op_srl, ALUOperation.SRA: self._op_sra,
+            ALUOperation.SLT: self._op_slt, ALUOperation.SLTU: self._op_sltu,
+            ALUOperation.MUL: self._op_mul, ALUOperation.DIV: self._op_div, ALUOperation.REM: self._op_rem,
+            ALUOperation.PASS_A: self._op_pass_a, ALUOperation.PASS_B: self._op_pass_b,
+        }
+        # Same handlers as a dense table indexed by ALUOperation value (the code in a packed control word)
+        self._handlers = tuple(self._dispatch[op] for op in sorted(ALUOperation, key=lambda op: op.value))
+
+    def execute(self, operation: ALUOperation, operand_a: Bits, operand_b: Bits) -> Tuple[Bits, ALUFlags]:
+        """
+        Execute ALU operation on bit vectors and return result + flags
+        Operands are packed to words once, result is unpacked once
+        """
+        result, flags = self.execute_int(operation, bits_to_word(operand_a), bits_to_word(operand_b))
+        return word_to_bits(result), flags
+
+    def execute_int(self, operation: ALUOperation, operand_a: Word, operand_b: Word) -> Tuple[Word, ALUFlags]:
         """
         Execute ALU operation and return result + flags
-        
+
         Args:
             operation: ALU operation to perform
-            operand_a: First operand (32-bit)
-            operand_b: Second operand (32-bit)
-            
+            operand_a: First operand, unsigned 32-bit word in [0, 2**32)
+            operand_b: Second operand, unsigned 32-bit word in [0, 2**32)
+
+        Operands are not re-masked; producers (register file, immediate select) keep them in range.
+
         Returns:
-            Tuple of (result_bits, flags_dict)
-            flags_dict contains: N, Z, C, V flags
+            Tuple of (result_word, flags)
+            flags is a shared ALUFlags(N, Z, C, V) tuple
+        """
+        try:
+            handler = self._dispatch[operation]
+        except KeyError:
+            raise ValueError(f"Unsupported ALU operation: {operation}") from None
+        return handler(operand_a, operand_b)
+
+    def execute_code(self, op_code: int, operand_a: Word, operand_b: Word) -> Tuple[Word, ALUFlags]:
+        """
+        Execute the ALU operation with value op_code on 32-bit words
+        Same contract as execute_int, but dispatches by plain int index (no enum involved)
         """
-        # Ensure operands are 32 bits
-        if len(operand_a) != 32:
-            operand_a = left_pad(operand_a, 32, 0)
-        if len(operand_b) != 32:
-            operand_b = left_pad(operand_b, 32, 0)
-        
-        # Initialize default flags
-        flags = {"N": 0, "Z": 0, "C": 0, "V": 0}
-        
-        if operation == ALUOperation.ADD:
-            result, flags = alu(operand_a, operand_b, "ADD")
-            
-        elif operation == ALUOperation.SUB:
-            result, flags = alu(operand_a, operand_b, "SUB")
-            
-        elif operation == ALUOperation.AND:
-            result = self._bitwise_and(operand_a, operand_b)
-            flags = self._compute_logic_flags(result)
-            
-        elif operation == ALUOperation.OR:
-            result = self._bitwise_or(operand_a, operand_b)
-            flags = self._compute_logic_flags(result)
-            
-        elif operation == ALUOperation.XOR:
-            result = self._bitwise_xor(operand_a, operand_b)
-            flags = self._compute_logic_flags(result)
-            
-        elif operation == ALUOperation.SLL:
-            # Shift amount is bottom 5 bits of operand_b
-            shift_amount = self._extract_shift_amount(operand_b)
-            result = shifter(operand_a, shift_amount, "SLL")
-            flags = self._compute_logic_flags(result)
-            
-        elif operation == ALUOperation.SRL:
-            shift_amount = self._extract_shift_amount(operand_b)
-            result = shifter(operand_a, shift_amount, "SRL")
-            flags = self._compute_logic_flags(result)
-            
-        elif operation == ALUOperation.SRA:
-            shift_amount = self._extract_shift_amount(operand_b)
-            result = shifter(operand_a, shift_amount, "SRA")
-            flags = self._compute_logic_flags(result)
-            
-        elif operation == ALUOperation.SLT:
-            # Set if operand_a < operand_b (signed)
-            result = self._set_less_than_signed(operand_a, operand_b)
-            flags = self._compute_logic_flags(result)
-            
-        elif operation == ALUOperation.SLTU:
-            # Set if operand_a < operand_b (unsigned)
-            result = self._set_less_than_unsigned(operand_a, operand_b)
-            flags = self._compute_logic_flags(result)
-            
-        elif operation == ALUOperation.MUL:
-            # 32x32 -> 32 multiply
-            mdu_result = mdu_mul("MUL", operand_a, operand_b)
-            result = mdu_result["rd_bits"]
-            flags = self._compute_logic_flags(result)
-            
-        elif operation == ALUOperation.DIV:
-            # Division - determine signed vs unsigned based on operation
-            div_result = mdu_div("DIV", operand_a, operand_b)
-            result = div_result["q_bits"]
-            flags = self._compute_logic_flags(result)
-            flags["V"] = div_result["overflow"]  # Set overflow flag
-            
-        elif operation == ALUOperation.REM:
-            # Remainder
-            rem_result = mdu_div("REM", operand_a, operand_b)
-            result = rem_result["r_bits"]
-            flags = self._compute_logic_flags(result)
-            
-        elif operation == ALUOperation.PASS_A:
-            result = operand_a[:]
-            flags = self._compute_logic_flags(result)
-            
-        elif operation == ALUOperation.PASS_B:
-            result = operand_b[:]
-            flags = self._compute_logic_flags(result)
-            
+        try:
+            handler = self._handlers[op_code]
+        except IndexError:
+            raise ValueError(f"Unsupported ALU operation code: {op_code}") from None
+        return handler(operand_a, operand_b)
+
+    def _op_add(self, a: Word, b: Word) -> Tuple[Word, ALUFlags]:
+        return self._add_sub(a, b, subtract=False)
+
+    def _op_sub(self, a: Word, b: Word) -> Tuple[Word, ALUFlags]:
+        return self._add_sub(a, b, subtract=True)
+
+    def _op_and(self, a: Word, b: Word) -> Tuple[Word, ALUFlags]:
+        result = a & b
+        return result, self._compute_logic_flags(result)
+
+    def _op_or(self, a: Word, b: Word) -> Tuple[Word, ALUFlags]:
+        result = a | b
+        return result, self._compute_logic_flags(result)
+
+    def _op_xor(self, a: Word, b: Word) -> Tuple[Word, ALUFlags]:
+        result = a ^ b
+        return result, self._compute_logic_flags(result)
+
+    def _op_sll(self, a: Word, b: Word) -> Tuple[Word, ALUFlags]:
+        # Shift amount is bottom 5 bits of operand_b
+        result = (a << self._extract_shift_amount(b)) & WORD_MASK
+        return result, self._compute_logic_flags(result)
+
+    def _op_srl(self, a: Word, b: Word) -> Tuple[Word, ALUFlags]:
+        result = a >> self._extract_shift_amount(b)
+        return result, self._compute_logic_flags(result)
+
+    def _op_sra(self, a: Word, b: Word) -> Tuple[Word, ALUFlags]:
+        result = (word_to_signed(a) >> self._extract_shift_amount(b)) & WORD_MASK
+        return result, self._compute_logic_flags(result)
+
+    def _op_slt(self, a: Word, b: Word) -> Tuple[Word, ALUFlags]:
+        # Set if a < b (signed)
+        result = int(word_to_signed(a) < word_to_signed(b))
+        return result, self._compute_logic_flags(result)
+
+    def _op_sltu(self, a: Word, b: Word) -> Tuple[Word, ALUFlags]:
+        # Set if a < b (unsigned)
+        result = int(a < b)
+        return result, self._compute_logic_flags(result)
+
+    def _op_mul(self, a: Word, b: Word) -> Tuple[Word, ALUFlags]:
+        # 32x32 -> 32 multiply (low word is the same for signed and unsigned)
+        result = (a * b) & WORD_MASK
+        return result, self._compute_logic_flags(result)
+
+    def _op_div(self, a: Word, b: Word) -> Tuple[Word, ALUFlags]:
+        result, _, overflow = self._divide_signed(a, b)
+        return result, _FLAGS[(result >> 31) << 3 | (result == 0) << 2 | overflow]
+
+    def _op_rem(self, a: Word, b: Word) -> Tuple[Word, ALUFlags]:
+        _, result, _ = self._divide_signed(a, b)
+        return result, self._compute_logic_flags(result)
+
+    def _op_pass_a(self, a: Word, b: Word) -> Tuple[Word, ALUFlags]:
+        return a, self._compute_logic_flags(a)
+
+    def _op_pass_b(self, a: Word, b: Word) -> Tuple[Word, ALUFlags]:
+        return b, self._compute_logic_flags(b)
+
+    def _add_sub(self, a: Word, b: Word, subtract: bool) -> Tuple[Word, ALUFlags]:
+        """ADD/SUB with N, Z, C, V flags (SUB is a + two's-complement(b))"""
+        addend = (-b) & WORD_MASK if subtract else b
+        total = a + addend
+        result = total & WORD_MASK
+        if subtract:
+            # Overflow iff sign(a) != sign(b) and sign(result) != sign(a)
+            overflow = (((a ^ b) & (a ^ result)) >> 31) & 1
         else:
-            raise ValueError(f"Unsupported ALU operation: {operation}")
-        
-        return result, flags
-    
-    def _bitwise_and(self, a: Bits, b: Bits) -> Bits:
-        """Bitwise AND operation"""
-        return [a[i] & b[i] for i in range(len(a))]
-    
-    def _bitwise_or(self, a: Bits, b: Bits) -> Bits:
-        """Bitwise OR operation"""
-        return [a[i] | b[i] for i in range(len(a))]
-    
-    def _bitwise_xor(self, a: Bits, b: Bits) -> Bits:
-        """Bitwise XOR operation"""
-        return [a[i] ^ b[i] for i in range(len(a))]
-    
-    def _extract_shift_amount(self, operand: Bits) -> int:
+            # Overflow iff sign(a) == sign(b) and sign(result) != sign(a)
+            overflow = ((~(a ^ b) & (a ^ result)) >> 31) & 1
+        return result, _FLAGS[(result >> 31) << 3 | (result == 0) << 2 | (total >> 32) << 1 | overflow]
+
+    def _divide_signed(self, a: Word, b: Word) -> Tuple[Word, Word, int]:
+        """
+        Signed division with RISC-V semantics
+        Returns (quotient, remainder, overflow)
+        """
+        if b == 0:
+            # q = all 1s, r = dividend
+            return WORD_MASK, a, 0
+        dividend, divisor = word_to_signed(a), word_to_signed(b)
+        if dividend == -0x80000000 and divisor == -1:
+            return 0x80000000, 0, 1
+        # Quotient truncates toward zero; remainder has the sign of the dividend
+        quotient = abs(dividend) // abs(divisor)
+        if (dividend < 0) != (divisor < 0):
+            quotient = -quotient
+        remainder = dividend - quotient * divisor
+        return quotient & WORD_MASK, remainder & WORD_MASK, 0
+
+    def _extract_shift_amount(self, operand: Word) -> int:
         """Extract 5-bit shift amount from operand"""
         # Bottom 5 bits
-        shift_bits = operand[27:32]  # Bits 4:0
-        shift_amount = 0
-        for bit in shift_bits:
-            shift_amount = (shift_amount << 1) | bit
-        return shift_amount
-    
-    def _set_less_than_signed(self, a: Bits, b: Bits) -> Bits:
-        """Set if a < b (signed comparison)"""
-        # Use SUB operation and check sign
-        result, flags = alu(a, b, "SUB")
-        # If result is negative, then a < b
-        is_less = flags["N"]
-        return [0] * 31 + [is_less]
-    
-    def _set_less_than_unsigned(self, a: Bits, b: Bits) -> Bits:
-        """Set if a < b (unsigned comparison)"""
-        # Convert to unsigned integers for comparison
-        a_val = 0
-        b_val = 0
-        for bit in a:
-            a_val = (a_val << 1) | bit
-        for bit in b:
-            b_val = (b_val << 1) | bit
-        
-        is_less = 1 if a_val < b_val else 0
-        return [0] * 31 + [is_less]
-    
-    def _compute_logic_flags(self, result: Bits) -> Dict[str, int]:
+        return operand & 0x1F
+
+    def _compute_logic_flags(self, result: Word) -> ALUFlags:
         """Compute N and Z flags for logic operations"""
-        flags = {"N": 0, "Z": 0, "C": 0, "V": 0}
-        
-        # N flag: result is negative (MSB = 1)
-        flags["N"] = result[0]
-        
-        # Z flag: result is zero
-        flags["Z"] = 1 if all(bit == 0 for bit in result) else 0
-        
-        return flags
-    
+        # N flag: result is negative (MSB = 1), Z flag: result is zero
+        return _FLAGS[(result >> 31) << 3 | (result == 0) << 2]
+
     def execute_branch_compare(self, operation: str, operand_a: Bits, operand_b: Bits) -> bool:
         """
-        Execute branch comparison operations
+        Execute branch comparison operations on bit vectors
         Returns True if branch should be taken
         """
-        if operation == "BEQ":
-            # Branch if equal
-            result, _ = alu(operand_a, operand_b, "SUB")
-            return all(bit == 0 for bit in result)
-            
-        elif operation == "BNE":
-            # Branch if not equal
-            result, _ = alu(operand_a, operand_b, "SUB")
-            return not all(bit == 0 for bit in result)
-            
-        elif operation == "BLT":
-            # Branch if less than (signed)
-            _, flags = alu(operand_a, operand_b, "SUB")
-            return bool(flags["N"])
-            
-        elif operation == "BGE":
-            # Branch if greater than or equal (signed)
-            _, flags = alu(operand_a, operand_b, "SUB")
-            return not bool(flags["N"])
-            
-        elif operation == "BLTU":
-            # Branch if less than (unsigned)
-            # Convert to unsigned for comparison
-            a_val = sum(bit << (31-i) for i, bit in enumerate(operand_a))
-            b_val = sum(bit << (31-i) for i, bit in enumerate(operand_b))
-            return a_val < b_val
-            
-        elif operation == "BGEU":
-            # Branch if greater than or equal (unsigned)
-            a_val = sum(bit << (31-i) for i, bit in enumerate(operand_a))
-            b_val = sum(bit << (31-i) for i, bit in enumerate(operand_b))
-            return a_val >= b_val
-            
-        else:
-            raise ValueError(f"Unsupported branch operation: {operation}")
+        return self.execute_branch_compare_int(operation, bits_to_word(operand_a), bits_to_word(operand_b))
+
+    def execute_branch_compare_int(self, operation: str, operand_a: Word, operand_b: Word) -> bool:
+        """
+        Execute branch comparison operations on 32-bit words
+        Returns True if branch should be taken
+        """
+        try:
+            compare, bias = _BRANCH_COMPARE[operation]
+        except KeyError:
+            raise ValueError(f"Unsupported branch operation: {operation}") from None
+        return compare(operand_a ^ bias, operand_b ^ bias)
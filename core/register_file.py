@@ -1,45 +1,47 @@
 """
 RISC-V Register File Implementation
 32 registers (x0-x31) with x0 hardwired to zero
-Uses utils bit-vector utilities for data representation
+Registers hold 32-bit words; the bit-vector methods convert at the boundary
 """
 
-from typing import List, Optional
-from utils import Bits, zero_bits, left_pad, encode_twos_complement, decode_twos_complement
+from typing import List
+from utils import Bits, Word, WORD_MASK, left_pad, bits_to_word, word_to_bits, word_to_signed
+
+
+X0_SINK = 32  # Index in RegisterFile.registers that absorbs writes to x0
 
 
 class RegisterFile:
+    __slots__ = ('registers',)
+    
     def __init__(self):
-        # 32 registers, each 32 bits wide
-        # Register x0 is hardwired to zero
-        self.registers: List[Bits] = [zero_bits(32) for _ in range(32)]
+        # 32 registers, each a 32-bit word, plus a scratch slot at index 32
+        # Register x0 is hardwired to zero: writes to it land in the scratch slot
+        self.registers: List[Word] = [0] * 33
     
     def read_register(self, reg_num: int) -> Bits:
         """
         Read from register reg_num
         Returns 32-bit value as bit vector
         """
+        return word_to_bits(self.read_register_int(reg_num))
+    
+    def read_register_int(self, reg_num: int) -> Word:
+        """
+        Read from register reg_num
+        Returns 32-bit value as an unsigned word
+        """
         if not (0 <= reg_num <= 31):
             raise ValueError(f"Invalid register number: {reg_num}")
         
-        # x0 is always zero
-        if reg_num == 0:
-            return zero_bits(32)
-        
-        return self.registers[reg_num][:]  # Return copy
+        # x0 is never written, so it always reads zero
+        return self.registers[reg_num]
     
     def write_register(self, reg_num: int, value: Bits) -> None:
         """
         Write value to register reg_num
         x0 writes are ignored (hardwired to zero)
         """
-        if not (0 <= reg_num <= 31):
-            raise ValueError(f"Invalid register number: {reg_num}")
-        
-        # x0 is hardwired to zero - ignore writes
-        if reg_num == 0:
-            return
-        
         # Ensure value is 32 bits
         if len(value) != 32:
             if len(value) < 32:
@@ -47,7 +49,19 @@ class RegisterFile:
             else:
                 value = value[-32:]  # Truncate to 32 bits
         
-        self.registers[reg_num] = value[:]
+        self.write_register_int(reg_num, bits_to_word(value))
+    
+    def write_register_int(self, reg_num: int, value: Word) -> None:
+        """
+        Write a word to register reg_num, masked to 32 bits
+        x0 writes are ignored (hardwired to zero)
+        """
+        if not (0 <= reg_num <= 31):
+            raise ValueError(f"Invalid register number: {reg_num}")
+        
+        # x0 is hardwired to zero - its writes go to the scratch slot and are never read
+        # Mask once here so every reader sees a value in [0, 2**32)
+        self.registers[reg_num or X0_SINK] = value & WORD_MASK
     
     def read_two_registers(self, rs1: int, rs2: int) -> tuple[Bits, Bits]:
         """
@@ -59,40 +73,32 @@ class RegisterFile:
         """
         Get register value as signed integer (for debugging/testing)
         """
-        bits = self.read_register(reg_num)
-        decoded = decode_twos_complement(bits)
-        return int(decoded['value_str'])
+        return word_to_signed(self.read_register_int(reg_num))
     
     def set_register_value_int(self, reg_num: int, value: int) -> None:
         """
         Set register value from signed integer (for debugging/testing)
+        Values outside 32 bits wrap, as in two's complement
         """
-        encoded = encode_twos_complement(str(value))
-        # Convert hex string to bits
-        hex_str = encoded['hex'][2:]  # Remove '0x'
-        bits = []
-        for hex_char in hex_str:
-            nibble = int(hex_char, 16)
-            for i in range(3, -1, -1):
-                bits.append((nibble >> i) & 1)
-        self.write_register(reg_num, bits)
+        self.write_register_int(reg_num, value)
+    
+    def snapshot_int(self) -> List[Word]:
+        """
+        Copy of x0-x31 as unsigned words (one slice, for bulk checks)
+        """
+        return self.registers[:32]
     
     def reset(self) -> None:
         """
         Reset all registers to zero
         """
-        self.registers = [zero_bits(32) for _ in range(32)]
+        self.registers = [0] * 33
     
     def get_register_state(self) -> str:
         """
         Return string representation of all non-zero registers
         """
-        result = "Register File State:\n"
-        for i in range(32):
-            if i == 0:
-                result += f"x{i:2d} (zero): 0x00000000\n"
-            else:
-                value = self.get_register_value_int(i)
-                if value != 0:
-                    result += f"x{i:2d}: 0x{value & 0xFFFFFFFF:08X} ({value})\n"
-        return result
\ No newline at end of file
+        lines = ["Register File State:", "x 0 (zero): 0x00000000"]
+        lines += [f"x{i:2d}: 0x{word:08X} ({word_to_signed(word)})"
+                  for i, word in enumerate(self.registers[1:32], 1) if word]
+        return "\n".join(lines) + "\n"
@@ -3,32 +3,54 @@ RISC-V Single-Cycle Datapath Implementation
 Connects all components: PC, instruction memory, decoder, control, register file, ALU, data memory
 """
 
-from typing import Dict, Any, Optional, Tuple
-from utils import Bits, zero_bits, left_pad, add_rca, bits_to_hex, encode_twos_complement, decode_twos_complement
+from functools import partial
+from typing import Dict, Any, Callable, List, Optional
+from utils import Bits, Word, WORD_MASK, left_pad, add_rca, bits_to_hex, bits_to_word, word_to_bits, encode_twos_complement, decode_twos_complement
 
 # Import core components
-from .instruction_decoder import InstructionDecoder, InstructionType
-from .control_unit import ControlUnit, ControlSignals, ALUOperation
-from .register_file import RegisterFile
+from .instruction_decoder import InstructionDecoder, InstructionType, DecodedInstruction
+from .control_unit import (ControlUnit, ControlSignals, CompiledBlock, ALUOperation,
+                           REG_WRITE, ALU_SRC_B, MEM_READ, MEM_WRITE, BRANCH, JUMP, PC_SRC, ALU_OP_SHIFT, ALU_OP_MASK)
+from .register_file import RegisterFile, X0_SINK
 from .memory_interface import MemoryInterface
 from .integrated_alu import IntegratedALU
 
 
+OPCODE_JAL = 0b1101111  # JUMP-flagged instructions are JAL or JALR; the opcode tells them apart
+
+HOT_BLOCK_THRESHOLD = 8   # Visits to a PC before run_program compiles the block starting there
+MAX_BLOCK_LENGTH = 32     # Max instructions fetched when compiling a block
+
+
 class SingleCycleDatapath:
     """
     RISC-V Single-Cycle CPU Datapath
     Implements fetch-decode-execute cycle for RV32I + M extensions
     """
+    __slots__ = ('pc', 'instruction_memory', 'data_memory', 'register_file', 'alu', 'control_unit',
+                 '_loads', '_stores', 'cycle_count', 'instruction_count', 'halt',
+                 'last_instruction', 'last_pc', 'debug_mode', '_pc_hits', '_blocks')
     
     def __init__(self, memory_size: int = 1024):
         # Core components
-        self.pc = zero_bits(32)  # Program Counter
+        self.pc = 0  # Program Counter (32-bit byte address)
         self.instruction_memory = MemoryInterface(memory_size)
         self.data_memory = MemoryInterface(memory_size)
         self.register_file = RegisterFile()
         self.alu = IntegratedALU()
         self.control_unit = ControlUnit()
         
+        # Data memory accessors by operation, bound once
+        memory = self.data_memory
+        self._loads: Dict[str, Callable[[Word], Word]] = {
+            "LW": memory.load_word_int,
+            "LH": memory.load_halfword_int, "LHU": partial(memory.load_halfword_int, unsigned=True),
+            "LB": memory.load_byte_int, "LBU": partial(memory.load_byte_int, unsigned=True),
+        }
+        self._stores: Dict[str, Callable[[Word, Word], None]] = {
+            "SW": memory.store_word_int, "SH": memory.store_halfword_int, "SB": memory.store_byte_int,
+        }
+        
         # Execution state
         self.cycle_count = 0
         self.instruction_count = 0
@@ -36,60 +58,38 @@ class SingleCycleDatapath:
         
         # Debug information
         self.last_instruction = 0
-        self.last_pc = zero_bits(32)
+        self.last_pc = 0
         self.debug_mode = False
+        
+        # Hot straight-line ALU blocks compiled by the control unit, keyed by start PC, each as
+        # [block, instruction words it was compiled from, instruction memory version they were
+        # last checked at] (None where the PC does not start a block)
+        self._pc_hits: Dict[int, int] = {}
+        self._blocks: Dict[int, Optional[List[Any]]] = {}
     
     def _bits_to_int(self, bits: Bits) -> int:
         """Convert bits to unsigned integer"""
-        result = 0
-        for bit in bits:
-            result = (result << 1) | bit
-        return result
+        return bits_to_word(bits)
     
     def _int_to_bits(self, value: int, width: int = 32) -> Bits:
         """Convert integer to bits"""
-        bits = []
-        for i in range(width-1, -1, -1):
-            bits.append((value >> i) & 1)
-        return bits
-    
-    def _sign_extend_immediate(self, immediate: int, width: int) -> Bits:
-        """Sign extend immediate to 32 bits"""
-        # Handle negative immediates
-        if immediate < 0:
-            # Two's complement representation
-            immediate = (1 << width) + immediate
-        
-        # Extract sign bit
-        sign_bit = (immediate >> (width - 1)) & 1
-        
-        # Create 32-bit representation
-        bits = []
-        for i in range(31, -1, -1):
-            if i >= width:
-                bits.append(sign_bit)  # Sign extend
-            else:
-                bits.append((immediate >> i) & 1)
-        
-        return bits
+        return word_to_bits(value, width)
     
     def load_program(self, hex_file_path: str, base_address: int = 0) -> None:
         """Load program into instruction memory"""
         self.instruction_memory.load_program(hex_file_path, base_address)
-        self.pc = self._int_to_bits(base_address)
+        self.pc = base_address & WORD_MASK
+        self._pc_hits.clear()
+        self._blocks.clear()
         print(f"Program loaded from {hex_file_path} at address {base_address:#x}")
     
     def fetch_instruction(self) -> int:
         """Fetch instruction from memory at current PC"""
-        # Load instruction from memory
-        instruction_bits = self.instruction_memory.load_instruction(self.pc)
-        
-        # Convert to integer for decoder
-        instruction = self._bits_to_int(instruction_bits)
+        # Load instruction word from memory
+        instruction = self.instruction_memory.load_instruction_int(self.pc)
         
         if self.debug_mode:
-            pc_int = self._bits_to_int(self.pc)
-            print(f"FETCH: PC={pc_int:#x}, Instruction={instruction:#08x}")
+            print(f"FETCH: PC={self.pc:#x}, Instruction={instruction:#08x}")
         
         return instruction
     
@@ -101,40 +101,42 @@ class SingleCycleDatapath:
         if self.halt:
             return False
         
+        pc = self.pc
+        debug = self.debug_mode
         try:
             # Store current state for debugging
-            self.last_pc = self.pc[:]
+            self.last_pc = pc
             
-            # 1. FETCH
-            instruction = self.fetch_instruction()
+            # 1. FETCH (inlined fetch_instruction)
+            instruction = self.instruction_memory.load_instruction_int(pc)
             self.last_instruction = instruction
             
+            # 2. DECODE (a zero word decodes as ILLEGAL and is reported as a halt below)
+            # The control unit caches decodes by instruction word, so stores into instruction
+            # memory never leave a stale entry behind
+            decoded, control_signals = self.control_unit.decode_and_control(instruction)
+            
+            if debug:
+                self._debug_trace(pc, instruction, decoded, control_signals)
+            
             # Check for halt condition (all zeros or specific halt instruction)
             if instruction == 0:
-                print(f"HALT: Zero instruction encountered at PC={self._bits_to_int(self.pc):#x}")
+                print(f"HALT: Zero instruction encountered at PC={pc:#x}")
                 self.halt = True
                 return False
             
-            # 2. DECODE
-            decoded, control_signals = self.control_unit.decode_and_control(instruction)
-            
-            if decoded['operation'] == "ILLEGAL":
-                print(f"ERROR: Illegal instruction {instruction:#08x} at PC={self._bits_to_int(self.pc):#x}")
+            if decoded.operation == "ILLEGAL":
+                print(f"ERROR: Illegal instruction {instruction:#08x} at PC={pc:#x}")
                 self.halt = True
                 return False
             
-            if self.debug_mode:
-                print(f"DECODE: {decoded['operation']} (type: {decoded['instruction_type']})")
-                print(f"CONTROL: RegWrite={control_signals.reg_write}, MemRead={control_signals.mem_read}")
-            
             # 3. EXECUTE
             self._execute_instruction(decoded, control_signals)
             
             # 4. UPDATE PC (unless branch/jump modified it)
-            if not control_signals.pc_src:
+            if not control_signals & PC_SRC:
                 # PC = PC + 4 (normal increment)
-                pc_int = self._bits_to_int(self.pc)
-                self.pc = self._int_to_bits(pc_int + 4)
+                self.pc = (pc + 4) & WORD_MASK
             
             self.cycle_count += 1
             self.instruction_count += 1
@@ -142,119 +144,86 @@ class SingleCycleDatapath:
             return True
             
         except Exception as e:
-            print(f"ERROR during execution: {e}")
-            print(f"PC={self._bits_to_int(self.pc):#x}, Instruction={instruction:#08x}")
-            self.halt = True
+            self._fault(e, instruction)
             return False
     
-    def _execute_instruction(self, decoded: Dict[str, Any], control: ControlSignals) -> None:
-        """Execute decoded instruction with control signals"""
-        
-        # Extract instruction fields
-        rs1 = decoded.get('rs1', 0)
-        rs2 = decoded.get('rs2', 0)
-        rd = decoded.get('rd', 0)
-        immediate = decoded.get('immediate', 0)
-        operation = decoded['operation']
-        
-        # Read source registers
-        rs1_data = self.register_file.read_register(rs1) if rs1 != 0 else zero_bits(32)
-        rs2_data = self.register_file.read_register(rs2) if rs2 != 0 else zero_bits(32)
+    def _debug_trace(self, pc: int, instruction: int, decoded: DecodedInstruction, control: ControlSignals) -> None:
+        """Print the fetch and decode trace for one cycle (debug mode only)"""
+        print(f"FETCH: PC={pc:#x}, Instruction={instruction:#08x}")
+        if decoded.operation != "ILLEGAL":
+            print(f"DECODE: {decoded.operation} (type: {decoded.instruction_type})")
+            print(f"CONTROL: RegWrite={control.reg_write}, MemRead={control.mem_read}")
+    
+    def _fault(self, error: Exception, instruction: int) -> None:
+        """Report an exception raised while executing instruction and halt"""
+        print(f"ERROR during execution: {error}")
+        print(f"PC={self.pc:#x}, Instruction={instruction:#08x}")
+        self.halt = True
+    
+    def _execute_instruction(self, decoded: DecodedInstruction, control: ControlSignals) -> None:
+        """
+        Execute decoded instruction with control signals
+        Kept as one flat function over locals: register fields are 5-bit, so the register
+        list is indexed directly instead of going through the register file's checked accessors
+        """
+        registers = self.register_file.registers
+        rd = decoded.rd
+        operation = decoded.operation
         
-        # Select ALU operand B (register or immediate)
-        if control.alu_src_b:
-            # Use immediate
-            alu_operand_b = self._sign_extend_immediate(immediate, 32)
-        else:
-            # Use register
-            alu_operand_b = rs2_data
+        # Read source registers (the register file keeps x0 at zero)
+        rs1_data = registers[decoded.rs1]
+        rs2_data = registers[decoded.rs2]
         
-        # Execute ALU operation
-        if operation.startswith('B'):  # Branch instructions
-            branch_taken = self.alu.execute_branch_compare(operation, rs1_data, rs2_data)
-            if branch_taken:
+        if control & BRANCH:
+            # Branch: compare only, no ALU result and no register write
+            if self.alu.execute_branch_compare_int(operation, rs1_data, rs2_data):
                 # Calculate branch target: PC + immediate
-                pc_int = self._bits_to_int(self.pc)
-                target_address = pc_int + immediate
-                self.pc = self._int_to_bits(target_address)
+                self.pc = (self.pc + decoded.immediate) & WORD_MASK
                 if self.debug_mode:
-                    print(f"BRANCH TAKEN: {operation} to {target_address:#x}")
-        else:
-            # Regular ALU operation
-            alu_result, alu_flags = self.alu.execute(control.alu_op, rs1_data, alu_operand_b)
+                    print(f"BRANCH TAKEN: {operation} to {self.pc:#x}")
+            return
         
-        # Handle memory operations
-        if control.mem_read:
+        # Handle memory operations: the address is always rs1 + immediate, so it skips the ALU dispatch
+        if control & MEM_READ:
             # Load operation
-            memory_data = self._perform_load(operation, alu_result)
-            write_data = memory_data
-        elif control.mem_write:
-            # Store operation
-            self._perform_store(operation, alu_result, rs2_data)
-            write_data = None  # No register write for stores
+            try:
+                load = self._loads[operation]
+            except KeyError:
+                raise ValueError(f"Unsupported load operation: {operation}") from None
+            write_data = load((rs1_data + decoded.immediate_word) & WORD_MASK)
+        elif control & MEM_WRITE:
+            # Store operation, no register write
+            try:
+                store = self._stores[operation]
+            except KeyError:
+                raise ValueError(f"Unsupported store operation: {operation}") from None
+            store((rs1_data + decoded.immediate_word) & WORD_MASK, rs2_data)
+            return
         else:
-            # Use ALU result
-            write_data = alu_result if not operation.startswith('B') else None
+            # Execute ALU operation; operand B is the immediate (already a 32-bit word from decode) or rs2
+            write_data, alu_flags = self.alu.execute_code((control >> ALU_OP_SHIFT) & ALU_OP_MASK, rs1_data,
+                                                          decoded.immediate_word if control & ALU_SRC_B else rs2_data)
         
         # Handle jump operations
-        if control.jump:
-            if operation == "JAL":
-                # Store return address (PC + 4) in rd
-                pc_int = self._bits_to_int(self.pc)
-                return_address = self._int_to_bits(pc_int + 4)
-                if rd != 0:
-                    self.register_file.write_register(rd, return_address)
-                
+        if control & JUMP:
+            # Store return address (PC + 4) in rd
+            registers[rd or X0_SINK] = (self.pc + 4) & WORD_MASK
+            
+            if decoded.opcode == OPCODE_JAL:
                 # Jump to PC + immediate
-                target_address = pc_int + immediate
-                self.pc = self._int_to_bits(target_address)
-                
-            elif operation == "JALR":
-                # Store return address (PC + 4) in rd
-                pc_int = self._bits_to_int(self.pc)
-                return_address = self._int_to_bits(pc_int + 4)
-                if rd != 0:
-                    self.register_file.write_register(rd, return_address)
-                
-                # Jump to rs1 + immediate
-                rs1_int = self._bits_to_int(rs1_data)
-                target_address = (rs1_int + immediate) & ~1  # Clear LSB
-                self.pc = self._int_to_bits(target_address)
+                self.pc = (self.pc + decoded.immediate) & WORD_MASK
+            else:
+                # JALR: jump to rs1 + immediate
+                self.pc = (rs1_data + decoded.immediate) & WORD_MASK & ~1  # Clear LSB
         
         # Write back to register
-        if control.reg_write and rd != 0 and write_data is not None:
-            self.register_file.write_register(rd, write_data)
+        if control & REG_WRITE:
+            registers[rd or X0_SINK] = write_data & WORD_MASK
             
-            if self.debug_mode:
+            if self.debug_mode and rd != 0:
                 rd_value = self.register_file.get_register_value_int(rd)
                 print(f"WRITEBACK: x{rd} = {rd_value} ({rd_value:#x})")
     
-    def _perform_load(self, operation: str, address_bits: Bits) -> Bits:
-        """Perform load operation based on operation type"""
-        if operation == "LW":
-            return self.data_memory.load_word(address_bits)
-        elif operation == "LH":
-            return self.data_memory.load_halfword(address_bits, unsigned=False)
-        elif operation == "LHU":
-            return self.data_memory.load_halfword(address_bits, unsigned=True)
-        elif operation == "LB":
-            return self.data_memory.load_byte(address_bits, unsigned=False)
-        elif operation == "LBU":
-            return self.data_memory.load_byte(address_bits, unsigned=True)
-        else:
-            raise ValueError(f"Unsupported load operation: {operation}")
-    
-    def _perform_store(self, operation: str, address_bits: Bits, data_bits: Bits) -> None:
-        """Perform store operation based on operation type"""
-        if operation == "SW":
-            self.data_memory.store_word(address_bits, data_bits)
-        elif operation == "SH":
-            self.data_memory.store_halfword(address_bits, data_bits)
-        elif operation == "SB":
-            self.data_memory.store_byte(address_bits, data_bits)
-        else:
-            raise ValueError(f"Unsupported store operation: {operation}")
-    
     def run_program(self, max_cycles: int = 1000) -> Dict[str, Any]:
         """
         Run loaded program until halt or max cycles reached
@@ -263,9 +232,17 @@ class SingleCycleDatapath:
         print(f"Starting program execution...")
         start_cycle = self.cycle_count
         
-        for cycle in range(max_cycles):
-            if not self.execute_cycle():
-                break
+        execute_cycle = self.execute_cycle
+        remaining = max_cycles
+        while remaining > 0:
+            if self.debug_mode:
+                if not execute_cycle():
+                    break
+                remaining -= 1
+            else:
+                remaining -= self._run_cycles(remaining)
+                if self.halt:
+                    break
         else:
             print(f"WARNING: Program did not halt within {max_cycles} cycles")
             self.halt = True
@@ -276,10 +253,108 @@ class SingleCycleDatapath:
         return {
             "cycles_executed": cycles_executed,
             "instructions_executed": self.instruction_count,
-            "final_pc": self._bits_to_int(self.pc),
+            "final_pc": self.pc,
             "halted": self.halt
         }
     
+    def _run_cycles(self, limit: int) -> int:
+        """
+        Non-debug inner loop: run up to limit cycles and return how many completed
+        Decodable instructions execute inline over locals; a zero or illegal instruction
+        takes the full execute_cycle path, which reports it and halts.
+        Hot straight-line ALU runs execute as one compiled block.
+        Returns fewer than limit cycles only when the CPU halts.
+        """
+        if self.halt:
+            return 0
+        
+        load_instruction = self.instruction_memory.load_instruction_int
+        decode_and_control = self.control_unit.decode_and_control
+        execute = self._execute_instruction
+        hot_block = self._hot_block
+        
+        executed = 0
+        while executed < limit:
+            pc = self.pc
+            block = hot_block(pc)
+            if block is not None and block[1] <= limit - executed:
+                executed += self._run_block(block)
+                continue
+            
+            instruction = load_instruction(pc)
+            decoded, control = decode_and_control(instruction)
+            if decoded.operation == "ILLEGAL":
+                if not self.execute_cycle():
+                    return executed
+                executed += 1
+                continue
+            
+            self.last_pc = pc
+            self.last_instruction = instruction
+            try:
+                execute(decoded, control)
+            except Exception as e:
+                self._fault(e, instruction)
+                return executed
+            
+            if not control & PC_SRC:
+                self.pc = (self.pc + 4) & WORD_MASK
+            self.cycle_count += 1
+            self.instruction_count += 1
+            executed += 1
+        return executed
+    
+    def _hot_block(self, pc: int) -> Optional[CompiledBlock]:
+        """Return the compiled block at pc, compiling it once pc has been visited HOT_BLOCK_THRESHOLD times"""
+        if pc in self._blocks:
+            entry = self._blocks[pc]
+            if entry is None:
+                return None  # Running instructions one at a time is correct whatever memory holds
+            block, words, version = entry
+            memory = self.instruction_memory
+            if memory.version == version:
+                return block
+            # Instruction memory was written since the last check: the store may have patched the
+            # block's own instructions, in which case it is recompiled from the current words
+            if memory.read_words(pc >> 2, len(words)) != words:
+                return self._compile_block_at(pc)
+            entry[2] = memory.version
+            return block
+        
+        hits = self._pc_hits.get(pc, 0) + 1
+        self._pc_hits[pc] = hits
+        if hits < HOT_BLOCK_THRESHOLD:
+            return None
+        return self._compile_block_at(pc)
+    
+    def _compile_block_at(self, pc: int) -> Optional[CompiledBlock]:
+        """Compile the block starting at pc from the current instruction memory and cache it"""
+        words = []
+        for address in range(pc, pc + 4 * MAX_BLOCK_LENGTH, 4):
+            word = self.instruction_memory.load_instruction_int(address)
+            if word == 0:
+                break  # Halt instruction ends the block
+            words.append(word)
+        block = self.control_unit.compile_block(words)
+        # Keep only the words the block executes; they are re-checked after instruction memory writes
+        self._blocks[pc] = None if block is None else [block, words[:block[1]], self.instruction_memory.version]
+        return block
+    
+    def _run_block(self, block: CompiledBlock) -> int:
+        """
+        Execute a compiled block, move PC to the block's successor (fall-through or branch target)
+        and advance the counters; returns its instruction count
+        """
+        function, count = block
+        next_offset = function(self.register_file.registers)
+        
+        self.last_pc = (self.pc + 4 * (count - 1)) & WORD_MASK
+        self.last_instruction = self.instruction_memory.load_instruction_int(self.last_pc)
+        self.pc = (self.pc + next_offset) & WORD_MASK
+        self.cycle_count += count
+        self.instruction_count += count
+        return count
+    
     def set_debug_mode(self, enabled: bool) -> None:
         """Enable or disable debug output"""
         self.debug_mode = enabled
@@ -293,12 +368,27 @@ class SingleCycleDatapath:
         start_word = start_addr // 4
         return self.data_memory.dump_memory(start_word, num_words)
     
+    def get_memory_words(self, start_addr: int = 0, num_words: int = 16) -> List[Word]:
+        """Get data memory words starting at a byte address as ints"""
+        return self.data_memory.read_words(start_addr // 4, num_words)
+    
     def reset(self) -> None:
-        """Reset CPU to initial state"""
-        self.pc = zero_bits(32)
+        """Reset CPU to initial state (memory contents are kept; see clear_memory)"""
+        self.pc = 0
         self.register_file.reset()
         self.cycle_count = 0
         self.instruction_count = 0
         self.halt = False
+        self.last_instruction = 0
+        self.last_pc = 0
         self.debug_mode = False
-        print("CPU reset to initial state")
\ No newline at end of file
+        # Block profiling starts over; the control unit's decode cache is keyed by
+        # instruction word and stays valid
+        self._pc_hits.clear()
+        self._blocks.clear()
+        print("CPU reset to initial state")
+    
+    def clear_memory(self) -> None:
+        """Zero instruction and data memory, e.g. between tests that share one CPU"""
+        self.instruction_memory.clear()
+        self.data_memory.clear()
\ No newline at end of file
@@ -7,24 +7,20 @@ Surfaces standard flags: N (negative), Z (zero), C (carry out of MSB), V (signed
 """
 
 from typing import Dict, Literal, Tuple
-from bitvec import Bits, add_rca, twos_complement_negate, is_negative, zero_bits
+from bitvec import Bits, add_rca, twos_complement_negate, zero_bits
 
 ALUOp = Literal["ADD","SUB"]
 
 def _flags(result: Bits, carry_out: int, a: Bits, b: Bits, op: ALUOp) -> Dict[str, int]:
-    N = 1 if is_negative(result) else 0
-    Z = 1 if all(bit == 0 for bit in result) else 0
+    # Flags read only the sign bits plus one zero scan; sign bits are single gates
+    a_sign, r_sign = a[0], result[0]
+    N = r_sign
+    Z = 0 if 1 in result else 1
     C = 1 if carry_out == 1 else 0
 
-    # Signed overflow V (two's-complement rule)
-    a_sign = 1 if a[0] == 1 else 0
-    b_sign = 1 if b[0] == 1 else 0
-    r_sign = 1 if result[0] == 1 else 0
-
-    if op == "ADD":
-        V = 1 if (a_sign == b_sign and r_sign != a_sign) else 0
-    else:  # SUB: a + (~b + 1); overflow iff sign(a) != sign(b) and sign(result) != sign(a)
-        V = 1 if (a_sign != b_sign and r_sign != a_sign) else 0
+    # Signed overflow V (two's-complement rule): the result sign differs from both addend signs.
+    # SUB adds ~b + 1, so its addend sign is b's sign inverted.
+    V = (a_sign ^ r_sign) & (b[0] ^ (op != "ADD") ^ r_sign)
 
     return {"N": N, "Z": Z, "C": C, "V": V}
 
@@ -12,8 +12,15 @@ from typing import List, Tuple
 Bit = int  # 0 or 1
 Bits = List[Bit]  # MSB-first representation
 
+_BIT_VALUES = frozenset((0, 1))
+
 def _assert_bits(bits: Bits) -> None:
-    if not isinstance(bits, list) or not all(b in (0,1) for b in bits):
+    # issuperset scans the list in C; unhashable elements are not bits either
+    try:
+        valid = isinstance(bits, list) and _BIT_VALUES.issuperset(bits)
+    except TypeError:
+        valid = False
+    if not valid:
         raise TypeError("bits must be a list of 0/1 ints")
     if len(bits) == 0:
         raise ValueError("bits must be non-empty")
@@ -32,7 +39,7 @@ def left_pad(bits: Bits, width: int, fill: Bit = 0) -> Bits:
     _assert_bits(bits)
     if width < len(bits):
         raise ValueError("width smaller than bits length for left_pad")
-    return [fill] * (width - len(bits)) + bits[:]
+    return [fill] * (width - len(bits)) + bits
 
 def trim_width(bits: Bits, width: int) -> Bits:
     _assert_bits(bits)
@@ -44,21 +51,26 @@ def trim_width(bits: Bits, width: int) -> Bits:
 def bits_from_str(s: str) -> Bits:
     """Create bits from a string like '0001_1010' (underscores allowed)."""
     s = s.replace("_", "").strip()
-    if not s or any(ch not in "01" for ch in s):
+    # Anything left after stripping 0/1 from both ends is a non-bit character
+    if not s or s.strip("01"):
         raise ValueError("binary string must contain only 0/1")
-    return [1 if ch == "1" else 0 for ch in s]
+    return list(s.encode().translate(_DIGITS_TO_BITS))
+
+# bit values 0/1 <-> ASCII digits '0'/'1', and 0 <-> 1, for bytes.translate
+_BITS_TO_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+_DIGITS_TO_BITS = bytes.maketrans(b"01", b"\x00\x01")
+_INVERT_BITS = bytes.maketrans(b"\x00\x01", b"\x01\x00")
 
 def bits_to_str(bits: Bits, group: int = 4) -> str:
     """Pretty MSB-first string with underscores every 'group' bits."""
     _assert_bits(bits)
-    out = "".join("1" if b else "0" for b in bits)
+    out = bytes(bits).translate(_BITS_TO_DIGITS).decode()
     if group > 0:
-        parts = []
-        # group from rightmost side for nibble alignment
-        for i in range(len(out), 0, -group):
-            start = max(0, i - group)
-            parts.append(out[start:i])
-        return "_".join(reversed(parts))
+        # group from rightmost side for nibble alignment: only the leading group may be short
+        head = len(out) % group
+        parts = [out[:head]] if head else []
+        parts += [out[i:i+group] for i in range(head, len(out), group)]
+        return "_".join(parts)
     return out
 
 _HEX_LUT = {
@@ -67,6 +79,8 @@ _HEX_LUT = {
     "1000": "8","1001": "9","1010": "A","1011": "B",
     "1100": "C","1101": "D","1110": "E","1111": "F",
 }
+# Byte-wide table: every pair of nibble entries joined, "00010010" -> "12" (256 entries)
+_HEX_LUT8 = {hi + lo: hi_hex + lo_hex for hi, hi_hex in _HEX_LUT.items() for lo, lo_hex in _HEX_LUT.items()}
 
 def bits_to_hex(bits: Bits, width_multiple: int = 4) -> str:
     """Return zero-padded uppercase hex string without '0x' (manual lookup)."""
@@ -74,16 +88,23 @@ def bits_to_hex(bits: Bits, width_multiple: int = 4) -> str:
     # Left-pad to nibble boundary
     rem = len(bits) % width_multiple
     pad = 0 if rem == 0 else (width_multiple - rem)
-    padded = [0]*pad + bits[:]
-    out_chars = []
-    for i in range(0, len(padded), 4):
-        nibble = "".join("1" if b else "0" for b in padded[i:i+4])
-        out_chars.append(_HEX_LUT[nibble])
-    return "".join(out_chars)
+    # One C-level pass turns the bits into a '0'/'1' string (padded as text, not as a list copy);
+    # nibbles are then plain substrings
+    digits = "0" * pad + bytes(bits).translate(_BITS_TO_DIGITS).decode()
+    n = len(digits)
+    if n % 4:
+        # Odd width_multiple: the last group is not a full nibble and fails the lookup as before
+        return "".join([_HEX_LUT[digits[i:i+4]] for i in range(0, n, 4)])
+    # A leading odd nibble uses the 4-bit table; the rest go a byte (two hex digits) per lookup
+    head = n % 8
+    out = [_HEX_LUT[digits[:4]]] if head else []
+    out += [_HEX_LUT8[digits[i:i+8]] for i in range(head, n, 8)]
+    return "".join(out)
 
 def invert_bits(bits: Bits) -> Bits:
     _assert_bits(bits)
-    return [1 - b for b in bits]
+    # NOT gate on every bit as one C-level byte mapping
+    return list(bytes(bits).translate(_INVERT_BITS))
 
 def _half_adder(a: Bit, b: Bit) -> Tuple[Bit, Bit]:
     """Return (sum, carry)."""
@@ -113,17 +134,24 @@ def add_rca(a: Bits, b: Bits, cin: Bit = 0) -> Tuple[Bits, Bit]:
     res = [0] * width
     carry = cin
     for i in range(width-1, -1, -1):
-        s, carry = _full_adder(a[i], b[i], carry)
-        res[i] = s
+        # _full_adder inlined: sum = a XOR b XOR cin, carry = (a AND b) OR (cin AND (a XOR b))
+        ai = a[i]; bi = b[i]
+        t = ai ^ bi
+        res[i] = t ^ carry
+        carry = (ai & bi) | (t & carry)
     return res, carry
 
 def twos_complement_negate(bits: Bits) -> Bits:
-    """Return -bits (two's complement): invert + add 1 via the adder."""
+    """
+    Return -bits (two's complement). Invert + 1 carries through the trailing ones of the
+    inverse, so the result keeps the lowest set bit and the zeros below it and inverts the rest.
+    """
     _assert_bits(bits)
-    inv = invert_bits(bits)
-    one = zero_bits(len(bits)); one[-1] = 1
-    res, _ = add_rca(inv, one, 0)
-    return res
+    try:
+        low = len(bits) - 1 - bits[::-1].index(1)
+    except ValueError:
+        return bits[:]  # -0 == 0
+    return list(bytes(bits[:low]).translate(_INVERT_BITS)) + bits[low:]
 
 def is_negative(bits: Bits) -> bool:
     _assert_bits(bits)
@@ -3,67 +3,85 @@
 MDU (Multiply/Divide Unit) — multiply (shift-add) for RV32
 
 - Pure bit-vector implementation: no + - * / << >> on integers.
-- Uses ALU and shifter from our bit-vector core.
-- Exposes a simple interface for MUL (low 32 bits) with a per-step trace.
+- Uses the ripple-carry adder from our bit-vector core.
+- Exposes a simple interface for MUL (low 32 bits) with an optional per-step trace.
 
 API (initial):
-    mdu_mul(op, rs1_bits, rs2_bits) -> dict with keys:
+    mdu_mul(op, rs1_bits, rs2_bits, trace=False) -> dict with keys:
         rd_bits   : low 32-bit result (Bits)
         hi_bits   : high 32 bits of the 64-bit product (Bits)  (for future MULH* tests)
         overflow  : 0/1 (extra for grading: whether true 64-bit product doesn't fit signed 32)
-        trace     : list of per-iteration snapshots (strings)
+        trace     : list of per-iteration snapshots (strings); only built when trace=True
 Supported ops: "MUL" (signed * signed, low 32 bits). Others raise NotImplementedError for now.
 """
 
+from functools import lru_cache
 from typing import List, Dict, Tuple
-from bitvec import Bits, zero_bits, left_pad, trim_width, twos_complement_negate, add_rca, bits_to_str, bits_to_hex, is_negative
-from shifter import shifter
-from alu import alu
+from bitvec import Bits, zero_bits, trim_width, twos_complement_negate, add_rca, bits_to_str, bits_to_hex, is_negative
 
-def _sign_extend(bits: Bits, total_width: int) -> Bits:
-    sign = bits[0]
-    pad = [sign] * (total_width - len(bits))
-    return pad + bits[:]
+# All-zero starting accumulators; the loops rebind them to new lists and never write into them
+_ZERO32 = zero_bits(32)
+_ZERO34 = zero_bits(34)
+_ZERO64 = zero_bits(64)
 
-def _abs_bits(bits: Bits) -> Tuple[Bits, int]:
-    """Return (magnitude_bits, was_negative) for two's-complement input."""
-    if is_negative(bits):
-        return twos_complement_negate(bits), 1
-    return bits[:], 0
-
-def _equal_bits(a: Bits, b: Bits) -> bool:
-    if len(a) != len(b):
-        return False
-    return all(x==y for x,y in zip(a,b))
-
-def mdu_mul(op: str, rs1_bits: Bits, rs2_bits: Bits) -> Dict[str, object]:
-    if op not in ("MUL", "MULH", "MULHU", "MULHSU"):
-        raise NotImplementedError(f"Unsupported op: {op}")
-    if len(rs1_bits) != 32 or len(rs2_bits) != 32:
-        raise ValueError("MUL family expects 32-bit inputs")
+# Negative operands repeat (small constants, INT_MIN, -1); their magnitudes are cached per
+# operand given as bytes of 0/1 (a hashable form of the list), and each call gets a fresh list
+_CACHE_SIZE = 1024
 
-    # Choose signedness per op
-    if op in ("MUL", "MULH"):                    # signed × signed
-        a_mag, a_neg = _abs_bits(rs1_bits)
-        b_mag, b_neg = _abs_bits(rs2_bits)
-        res_neg = 1 if (a_neg ^ b_neg) else 0
-    elif op == "MULHU":                          # unsigned × unsigned
-        a_mag, b_mag = rs1_bits[:], rs2_bits[:]
-        res_neg = 0
-    else:  # "MULHSU"                            # signed × unsigned
-        a_mag, a_neg = _abs_bits(rs1_bits)
-        b_mag = rs2_bits[:]                      # use as magnitude; do NOT abs()
-        res_neg = a_neg
+@lru_cache(maxsize=_CACHE_SIZE)
+def _negate_cached(key: bytes) -> bytes:
+    """Two's-complement negation of the bit vector in key, as bytes of 0/1."""
+    return bytes(twos_complement_negate(list(key)))
 
+def _abs_bits(bits: Bits) -> Tuple[Bits, int]:
+    """Return (magnitude_bits, was_negative) for two's-complement input (read-only; not copied)."""
+    if is_negative(bits):
+        return list(_negate_cached(bytes(bits))), 1
+    return bits, 0
+
+def _mul_magnitudes(a_mag: Bits, b_mag: Bits) -> Bits:
+    """
+    64-bit product of two 32-bit magnitudes without a trace, radix-4: each step adds the
+    multiple 0, a, 2a or 3a picked by two multiplier bits, then shifts the 34-bit
+    accumulator right by two with those bits moving into the low half.
+    """
+    # A zero operand makes the whole product zero: skip building multiples and the 16 steps
+    if 1 not in a_mag or 1 not in b_mag:
+        return zero_bits(64)
+
+    # 34-bit multiples: 3a < 2**34, and the accumulator stays below 2**32 after each shift,
+    # so accumulator + multiple never carries out
+    a1 = [0, 0] + a_mag
+    a2 = [0] + a_mag + [0]
+    a3, _ = add_rca(a1, a2, 0)
+    multiples = ((None, a1), (a2, a3))   # indexed [high bit][low bit]
+
+    hi = _ZERO34
+    lo = []
+    for b_hi, b_lo in zip(b_mag[-2::-2], b_mag[::-2]):   # bit pairs from the LSB end
+        multiple = multiples[b_hi][b_lo]
+        if multiple is not None:
+            hi, _ = add_rca(hi, multiple, 0)
+        lo += hi[:-3:-1]                  # the two low bits, LSB first
+        hi = [0, 0] + hi[:-2]
+    lo.reverse()
+    return hi[2:] + lo
+
+def _mul_traced(a_mag: Bits, b_mag: Bits, trace: List[str]) -> Bits:
+    """64-bit product of two 32-bit magnitudes by 32 shift-add steps, one trace line per step."""
     # 64-bit accumulator + 64-bit mcand, 32-bit mplier (magnitudes)
-    acc = zero_bits(64)
-    mcand = left_pad(a_mag, 64)
+    acc = _ZERO64
+    mcand = _ZERO32 + a_mag     # a_mag zero-extended to 64 bits
     mplier = b_mag[:]
 
-    trace = []
     for step in range(32):
         if mplier[-1] == 1:
-            acc, _ = add_rca(acc, mcand, 0)
+            # mcand's low 'step' bits are zero and the sum stays below 2**(33+step), so only
+            # the 33-bit window [31-step, 64-step) can change; the rest of acc is kept as is
+            lo_i = 31 - step
+            hi_i = 64 - step
+            window, _ = add_rca(acc[lo_i:hi_i], mcand[lo_i:hi_i], 0)
+            acc = acc[:lo_i] + window + acc[hi_i:]
             action = "ADD"
         else:
             action = "NOP"
@@ -72,16 +90,58 @@ def mdu_mul(op: str, rs1_bits: Bits, rs2_bits: Bits) -> Dict[str, object]:
             f"step={step:02d} "
             f"acc=0x{bits_to_hex(acc)[-16:]} "
             f"mcand<<=1=0x{bits_to_hex(mcand)[-16:]} "
-            f"mplier=0x{bits_to_hex(left_pad(mplier,32))[-8:]} "
+            f"mplier=0x{bits_to_hex(mplier)[-8:]} "
             f"action={action}"
         )
         trace.append(t)
 
-        mcand = shifter(mcand, 1, "SLL")
-        mplier = shifter(mplier, 1, "SRL")
+        # Shift by one as a slice: no shifter call or extra copy per step
+        mcand = mcand[1:] + [0]
+        mplier = [0] + mplier[:-1]
+
+    return acc
+
+# Operand setup per op: each returns (a_mag, b_mag, res_neg)
+
+def _setup_signed(rs1_bits: Bits, rs2_bits: Bits) -> Tuple[Bits, Bits, int]:
+    """signed × signed (MUL, MULH)"""
+    a_mag, a_neg = _abs_bits(rs1_bits)
+    b_mag, b_neg = _abs_bits(rs2_bits)
+    return a_mag, b_mag, a_neg ^ b_neg
+
+def _setup_unsigned(rs1_bits: Bits, rs2_bits: Bits) -> Tuple[Bits, Bits, int]:
+    """unsigned × unsigned (MULHU)"""
+    return rs1_bits, rs2_bits, 0
+
+def _setup_signed_unsigned(rs1_bits: Bits, rs2_bits: Bits) -> Tuple[Bits, Bits, int]:
+    """signed × unsigned (MULHSU): rs2 is used as a magnitude; do NOT abs() it"""
+    a_mag, a_neg = _abs_bits(rs1_bits)
+    return a_mag, rs2_bits, a_neg
+
+_OP_SETUP = {
+    "MUL": _setup_signed,
+    "MULH": _setup_signed,
+    "MULHU": _setup_unsigned,
+    "MULHSU": _setup_signed_unsigned,
+}
+
+def mdu_mul(op: str, rs1_bits: Bits, rs2_bits: Bits, trace: bool = False) -> Dict[str, object]:
+    try:
+        setup = _OP_SETUP[op]
+    except (KeyError, TypeError):
+        raise NotImplementedError(f"Unsupported op: {op}") from None
+    if len(rs1_bits) != 32 or len(rs2_bits) != 32:
+        raise ValueError("MUL family expects 32-bit inputs")
+
+    # Signedness per op: magnitudes and the sign of the product
+    a_mag, b_mag, res_neg = setup(rs1_bits, rs2_bits)
+
+    # The per-step trace is optional; without it only set multiplier bits cost an add
+    steps: List[str] = []
+    acc = _mul_traced(a_mag, b_mag, steps) if trace else _mul_magnitudes(a_mag, b_mag)
 
     # Apply sign if needed (only the signed cases)
-    if res_neg == 1 and any(bit == 1 for bit in acc):
+    if res_neg == 1 and 1 in acc:
         acc = twos_complement_negate(acc)
 
     lo = acc[-32:]
@@ -89,8 +149,9 @@ def mdu_mul(op: str, rs1_bits: Bits, rs2_bits: Bits) -> Dict[str, object]:
 
     # Overflow flag (extra for grading): only meaningful for plain MUL
     if op == "MUL":
-        sx_lo_to_64 = _sign_extend(lo, 64)
-        overflow = 0 if _equal_bits(sx_lo_to_64, acc) else 1
+        # The product fits in 32 signed bits iff the high half is all copies of lo's sign bit;
+        # counting them is one C pass with no replicated comparison list
+        overflow = 0 if hi.count(lo[0]) == 32 else 1
     else:
         overflow = 0
 
@@ -98,5 +159,5 @@ def mdu_mul(op: str, rs1_bits: Bits, rs2_bits: Bits) -> Dict[str, object]:
         "rd_bits": lo,    # architectural result for MUL; for H-variants tests read hi_bits
         "hi_bits": hi,    # high 32 (used by MULH/MULHU/MULHSU)
         "overflow": overflow,
-        "trace": trace,
+        "trace": steps,
     }
@@ -12,21 +12,15 @@ from bitvec import Bits
 
 ShiftOp = Literal["SLL","SRL","SRA"]
 
-def _shift_once(bits: Bits, op: ShiftOp) -> Bits:
-    w = len(bits)
-    if op == "SLL":
-        return bits[1:] + [0]
-    elif op == "SRL":
-        return [0] + bits[:-1]
-    else: # SRA
-        sign = bits[0]
-        return [sign] + bits[:-1]
-
 def shifter(bits: Bits, shamt: int, op: ShiftOp) -> Bits:
     if shamt < 0:
         raise ValueError("shamt must be non-negative")
-    out = bits[:]
-    # iterate one-by-one; a barrel shifter is optional later
-    for _ in range(shamt):
-        out = _shift_once(out, op)
-    return out
+    if shamt == 0:
+        return bits[:]
+    # Barrel shift: move the whole amount with one slice + fill instead of shamt one-bit steps
+    if shamt > len(bits):
+        shamt = len(bits)  # every bit shifted out; only fill remains
+    if op == "SLL":
+        return bits[shamt:] + [0] * shamt
+    fill = [0] if op == "SRL" else bits[:1]  # SRA replicates the sign bit
+    return fill * shamt + bits[:-shamt]
@@ -0,0 +1,19 @@
+"""
+Host-int <-> bit-list converters shared by the tests (tests may use host ints).
+Not part of operations/: the graded modules never call these.
+"""
+
+# ASCII digits <-> bit values, so each conversion handles the whole string in one call
+_DIGITS_TO_BITS = bytes.maketrans(b"01", b"\x00\x01")
+_BITS_TO_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+
+def i2b(width, val):
+    """MSB-first bit list of the low 'width' bits of val (negatives wrap as two's complement)."""
+    return list(format(val & ((1 << width) - 1), f"0{width}b").encode().translate(_DIGITS_TO_BITS))
+
+def i2b32(val):
+    return i2b(32, val)
+
+def bits_to_int(bits):
+    """Unsigned value of an MSB-first bit list."""
+    return int(bytes(bits).translate(_BITS_TO_DIGITS), 2)
@@ -0,0 +1,5 @@
+import sys, os
+
+# The tests import the operations modules by their bare names (from bitvec import ...);
+# put operations/ on the path once for the whole session
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'operations'))
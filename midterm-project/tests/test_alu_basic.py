@@ -1,7 +1,3 @@
-
-import sys, os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'operations'))
-
 from bitvec import bits_from_str, bits_to_hex, twos_complement_negate
 from alu import alu
 
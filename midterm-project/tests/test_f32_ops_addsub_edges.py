@@ -1,18 +1,9 @@
-import sys, os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'operations'))
-
 from fpu_f32 import pack_f32_fields, classify_f32, bits_to_hex_str, fadd_f32, fsub_f32
-
-def i2b(w, v):
-    v &= (1<<w)-1
-    s = f"{v:0{w}b}"
-    return [1 if c=='1' else 0 for c in s]
+from bit_helpers import i2b, i2b32
 
 # handy constants
 def f32(hex8):  # quick literal loader for tests
-    h = int(hex8, 16)
-    bits = [ (h >> (31 - i)) & 1 for i in range(32) ]
-    return bits
+    return i2b32(int(hex8, 16))
 
 ONE      = pack_f32_fields(0, i2b(8,127), i2b(23,0))           # 1.0 -> 0x3F800000
 HALF     = pack_f32_fields(0, i2b(8,126), i2b(23,0))           # 0.5 -> 0x3F000000
@@ -1,12 +1,6 @@
-import sys, os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'operations'))
-
 from mdu_div import mdu_div
 from bitvec import bits_to_hex
-
-def i2b32(v: int):
-    v &= (1<<32)-1
-    return [1 if c=='1' else 0 for c in f"{v:032b}"]
+from bit_helpers import i2b32
 
 def h32(b): return bits_to_hex(b)[-8:]
 
@@ -48,3 +42,18 @@ def test_remu_div0():
     out = mdu_div("REMU", i2b32(0xDEADBEEF), i2b32(0))
     assert out["q_bits"] is None
     assert h32(out["r_bits"]) == "DEADBEEF"
+
+def test_div_trace_on_request():
+    fast = mdu_div("DIVU", i2b32(100), i2b32(7))
+    traced = mdu_div("DIVU", i2b32(100), i2b32(7), trace=True)
+    assert fast["trace"] == []
+    assert len(traced["trace"]) == 32
+    assert fast["q_bits"] == traced["q_bits"] and fast["r_bits"] == traced["r_bits"]
+
+def test_div_radix4_matches_traced():
+    pairs = [(0xFFFFFFFF, 1), (0xFFFFFFFF, 3), (0x80000000, 0xFFFFFFFF), (12345678, 0x7FFFFFFF), (-87654321, 97)]
+    for a, b in pairs:
+        for op in ("DIV", "DIVU", "REM", "REMU"):
+            fast = mdu_div(op, i2b32(a), i2b32(b))
+            traced = mdu_div(op, i2b32(a), i2b32(b), trace=True)
+            assert fast["q_bits"] == traced["q_bits"] and fast["r_bits"] == traced["r_bits"]
@@ -1,17 +1,7 @@
-
-import sys, os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'operations'))
-
 from bitvec import Bits
 from mdu import mdu_mul
 from bitvec import bits_to_hex
-
-def int_to_bits(width, val):
-    # tests may use Python arithmetic; allowed in tests
-    mask = (1 << width) - 1
-    v = val & mask
-    s = f"{v:0{width}b}"
-    return [1 if c == '1' else 0 for c in s]
+from bit_helpers import i2b as int_to_bits
 
 def hex32(bits):
     h = bits_to_hex(bits)
@@ -27,8 +17,18 @@ def test_mul_small():
 def test_mul_sign_and_overflow_sample():
     a = int_to_bits(32, 12345678)
     b = int_to_bits(32, -87654321)
-    out = mdu_mul("MUL", a, b)
+    out = mdu_mul("MUL", a, b, trace=True)
     assert hex32(out["rd_bits"]) == "D91D0712"
     assert out["overflow"] == 1
     # trace exists and has 32 steps
     assert len(out["trace"]) == 32
+
+def test_mul_without_trace():
+    a = int_to_bits(32, 12345678)
+    b = int_to_bits(32, -87654321)
+    for op in ("MUL", "MULH", "MULHU", "MULHSU"):
+        traced = mdu_mul(op, a, b, trace=True)
+        fast = mdu_mul(op, a, b)
+        assert fast["rd_bits"] == traced["rd_bits"] and fast["hi_bits"] == traced["hi_bits"]
+        assert fast["overflow"] == traced["overflow"]
+        assert fast["trace"] == []
@@ -1,12 +1,6 @@
-import sys, os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'operations'))
-
 from mdu import mdu_mul
 from bitvec import bits_to_hex
-
-def i2b32(v: int):
-    v &= (1<<32)-1
-    return [1 if c=='1' else 0 for c in f"{v:032b}"]
+from bit_helpers import i2b32
 
 def hex32(bits): return bits_to_hex(bits)[-8:]
 
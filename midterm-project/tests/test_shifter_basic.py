@@ -1,9 +1,15 @@
-
-import sys, os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'operations'))
-
 from bitvec import bits_from_str, bits_to_str
 from shifter import shifter
+from bit_helpers import i2b32
+
+def shifter_u32(x, n, op):
+    # packed-int reference (tests may use host ints); n < 32 as in RV32I
+    x &= 0xFFFFFFFF
+    if op == "SLL":
+        return (x << n) & 0xFFFFFFFF
+    if op == "SRL":
+        return x >> n
+    return ((x - (x >> 31 << 32)) >> n) & 0xFFFFFFFF  # SRA: shift the signed value
 
 def test_sll_srl_sra():
     x = bits_from_str('1001')  # -7 in 4-bit? (not relevant), just shape
@@ -17,3 +23,8 @@ def test_multi_shifts():
     assert bits_to_str(shifter(x,2,"SLL")) == '0000_0000_0000_0000_0000_0000_0011_0100'
     assert bits_to_str(shifter(x,2,"SRL")) == '0000_0000_0000_0000_0000_0000_0000_0011'
 
+def test_matches_packed_reference():
+    for x in (0x0000000D, 0x80000000, 0xFFFFFFFF, 0x7FFFFFFF, 0xDEADBEEF):
+        for n in (0, 1, 2, 7, 16, 31):
+            for op in ("SLL", "SRL", "SRA"):
+                assert shifter(i2b32(x), n, op) == i2b32(shifter_u32(x, n, op)), (hex(x), n, op)
@@ -1,6 +1,3 @@
-import sys, os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'operations'))
-
 from twos_complement import encode_twos_complement, decode_twos_complement
 
 def test_encode_examples():
@@ -19,7 +16,7 @@ def test_overflow_edge():
 def test_decode_roundtrip_small():
     for v in (-13, -7, -1, 0, 13):
         enc = encode_twos_complement(v)
-        dec = decode_twos_complement(enc['bin'].replace('_',''))
+        dec = decode_twos_complement(enc['bin'])  # decoder accepts the nibble underscores
         assert int(dec['value_str']) == v
 
 def test_decode_boundary():
@@ -27,3 +24,11 @@ def test_decode_boundary():
     int_max_bits = '0' + '1'*31
     assert int(decode_twos_complement(int_min_bits)['value_str']) == -2_147_483_648
     assert int(decode_twos_complement(int_max_bits)['value_str']) ==  2_147_483_647
+
+def test_repeated_calls_return_fresh_dicts():
+    first = encode_twos_complement(-13)
+    first['hex'] = 'changed'
+    assert encode_twos_complement('-13')['hex'] == '0xFFFFFFF3'
+    d = decode_twos_complement([1]*32)
+    d['sign'] = 0
+    assert decode_twos_complement('1'*32) == {'value_str': '-1', 'sign': -1}
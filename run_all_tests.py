@@ -7,7 +7,11 @@ Runs all test files and provides a comprehensive summary
 import unittest
 import sys
 import os
+import argparse
 import subprocess
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
 from io import StringIO
 import time
 
@@ -66,24 +70,33 @@ def run_integration_test(test_file):
     try:
         start_time = time.time()
         
-        # Run the script as a subprocess
-        result = subprocess.run(
-            [sys.executable, test_file], 
-            capture_output=True, 
-            text=True, 
-            timeout=60  # 60 second timeout
+        # Run the script as a subprocess, echoing its output (stderr merged in) line by line as it runs
+        process = subprocess.Popen(
+            [sys.executable, test_file],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1
         )
         
+        # 60 second timeout: kill the script, which closes its output and ends the read loop
+        watchdog = threading.Timer(60, process.kill)
+        watchdog.start()
+        try:
+            for line in process.stdout:
+                print(line, end='', flush=True)
+        finally:
+            timed_out = watchdog.finished.is_set()
+            watchdog.cancel()
+            process.stdout.close()
+        return_code = process.wait()
+        if timed_out:
+            raise subprocess.TimeoutExpired(process.args, 60)
+        
         end_time = time.time()
         execution_time = end_time - start_time
         
-        # Print the output
-        if result.stdout:
-            print(result.stdout)
-        if result.stderr:
-            print(f"STDERR: {result.stderr}")
-        
-        success = result.returncode == 0
+        success = return_code == 0
         
         return {
             'file': test_file,
@@ -92,7 +105,7 @@ def run_integration_test(test_file):
             'errors': 0,
             'success': success,
             'time': execution_time,
-            'return_code': result.returncode
+            'return_code': return_code
         }
         
     except subprocess.TimeoutExpired:
@@ -118,8 +131,33 @@ def run_integration_test(test_file):
             'exception': str(e)
         }
 
-def main():
+def run_in_dir(run, test_file, cwd=None):
+    """Run one test file from cwd if given, printing its output as it goes"""
+    original_dir = os.getcwd()
+    try:
+        if cwd:
+            os.chdir(cwd)
+        return run(test_file)
+    finally:
+        os.chdir(original_dir)
+
+def run_captured(run, test_file, cwd=None):
+    """
+    Run one test file with its printed output captured, from cwd if given
+    Returns (output, result) so parallel runs can print each file's output in one piece
+    """
+    output = StringIO()
+    with redirect_stdout(output):
+        result = run_in_dir(run, test_file, cwd)
+    return output.getvalue(), result
+
+def main(argv=None):
     """Run all CPU tests"""
+    parser = argparse.ArgumentParser(description="Run the RISC-V CPU test suite")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                        help="number of test files to run in parallel (default: CPU count)")
+    args = parser.parse_args(argv)
+    
     print("RISC-V Single-Cycle CPU - Complete Test Suite")
     print("=" * 80)
     
@@ -170,34 +208,37 @@ def main():
     
     print(f"Found {len(existing_unittest_tests)} unittest files, {len(existing_integration_tests)} integration tests...")
     
-    # Run all tests
+    # Unittest files, integration scripts, then parent directory tests (run from there)
+    tasks = ([(run_test_file, test_file, None) for test_file in existing_unittest_tests] +
+             [(run_integration_test, test_file, None) for test_file in existing_integration_tests] +
+             [(run_test_file, test_file, parent_dir) for test_file in parent_test_files])
+    
+    # Run all tests; the files are independent, so they can run in separate processes.
+    # Output is printed per file in the listed order either way: parallel runs capture each
+    # file's output and print it in one piece, serial runs print it live as it is produced.
     results = []
     total_start_time = time.time()
     
-    # Run unittest files
-    for test_file in existing_unittest_tests:
-        result = run_test_file(test_file)
-        results.append(result)
-    
-    # Run integration test files
-    for test_file in existing_integration_tests:
-        result = run_integration_test(test_file)
-        results.append(result)
-    
-    # Run parent directory tests if they exist
-    if parent_test_files:
-        print(f"\n{'='*60}")
-        print("Running tests from parent directory...")
-        print('='*60)
+    pool = ProcessPoolExecutor(max_workers=min(args.jobs, len(tasks))) if args.jobs > 1 and len(tasks) > 1 else None
+    try:
+        futures = [pool.submit(run_captured, *task) for task in tasks] if pool else None
         
-        original_dir = os.getcwd()
-        try:
-            os.chdir(parent_dir)
-            for test_file in parent_test_files:
-                result = run_test_file(test_file)
-                results.append(result)
-        finally:
-            os.chdir(original_dir)
+        parent_header_printed = False
+        for i, task in enumerate(tasks):
+            if task[2] and not parent_header_printed:
+                print(f"\n{'='*60}")
+                print("Running tests from parent directory...")
+                print('='*60)
+                parent_header_printed = True
+            if pool:
+                output, result = futures[i].result()
+                print(output, end='')
+            else:
+                result = run_in_dir(*task)
+            results.append(result)
+    finally:
+        if pool:
+            pool.shutdown()
     
     total_end_time = time.time()
     total_time = total_end_time - total_start_time
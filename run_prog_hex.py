@@ -21,7 +21,7 @@ def main():
     
     # Show initial CPU state
     print("\n=== INITIAL STATE ===")
-    print(f"PC: 0x{cpu._bits_to_int(cpu.pc):08x}")
+    print(f"PC: 0x{cpu.pc:08x}")
     print("Register file initialized (all zeros)")
     
     # Execute the program
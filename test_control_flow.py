@@ -3,35 +3,33 @@ Simplified Control Flow Tests - 4 Essential Tests
 """
 
 import unittest
-import sys
-import os
 
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from core.single_cycle_datapath import SingleCycleDatapath
+from utils import word_to_bits, bits_to_word
 # Use utility functions directly in the test class
 
 class TestControlFlow(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # One CPU shared by every test; setUp resets it instead of rebuilding it
+        cls.cpu = SingleCycleDatapath()
+    
     def setUp(self):
-        self.cpu = SingleCycleDatapath()
+        self.cpu.reset()
+        self.cpu.clear_memory()
     
     def _int_to_bits(self, value: int, width: int = 32):
         """Convert integer to bits"""
-        bits = []
-        for i in range(width-1, -1, -1):
-            bits.append((value >> i) & 1)
-        return bits
+        return word_to_bits(value, width)
     
     def _bits_to_int(self, bits):
         """Convert bits to integer"""
-        result = 0
-        for bit in bits:
-            result = (result << 1) | bit
-        return result
+        return bits_to_word(bits)
     
     def _load_and_execute_instruction(self, instruction, pc_value):
         """Helper to load and execute a single instruction"""
         # Set PC
-        self.cpu.pc = self._int_to_bits(pc_value, 32)
+        self.cpu.pc = pc_value
         
         # Store instruction in memory
         addr_bits = self._int_to_bits(pc_value, 32)
@@ -54,7 +52,7 @@ class TestControlFlow(unittest.TestCase):
         self._load_and_execute_instruction(beq_instruction, initial_pc)
         
         # PC should be updated by branch offset
-        pc_value = self._bits_to_int(self.cpu.pc)
+        pc_value = self.cpu.pc
         self.assertNotEqual(pc_value, initial_pc + 4, "BEQ should branch when values are equal")
     
     def test_branch_not_equal(self):
@@ -70,7 +68,7 @@ class TestControlFlow(unittest.TestCase):
         self._load_and_execute_instruction(bne_instruction, initial_pc)
         
         # PC should be updated by branch offset
-        pc_value = self._bits_to_int(self.cpu.pc)
+        pc_value = self.cpu.pc
         self.assertNotEqual(pc_value, initial_pc + 4, "BNE should branch when values are not equal")
     
     def test_branch_less_than(self):
@@ -86,7 +84,7 @@ class TestControlFlow(unittest.TestCase):
         self._load_and_execute_instruction(blt_instruction, initial_pc)
         
         # PC should be updated by branch offset
-        pc_value = self._bits_to_int(self.cpu.pc)
+        pc_value = self.cpu.pc
         self.assertNotEqual(pc_value, initial_pc + 4, "BLT should branch when rs1 < rs2")
     
     def test_jump_and_link(self):
@@ -98,12 +96,44 @@ class TestControlFlow(unittest.TestCase):
         self._load_and_execute_instruction(jal_instruction, initial_pc)
         
         # PC should be updated
-        pc_value = self._bits_to_int(self.cpu.pc)
+        pc_value = self.cpu.pc
         self.assertNotEqual(pc_value, initial_pc, "JAL should update PC")
         
         # x1 should contain return address
         return_addr = self.cpu.register_file.get_register_value_int(1)
         self.assertNotEqual(return_addr, 0, "JAL should store return address in x1")
 
+    def test_reset_keeps_program(self):
+        """Test reset restarts execution of the loaded program; clear_memory is what wipes it"""
+        self.cpu.instruction_memory.store_word_int(0, 0x00500093)  # ADDI x1, x0, 5
+        self.cpu.execute_cycle()
+        self.cpu.reset()
+        self.assertEqual(self.cpu.register_file.get_register_value_int(1), 0)
+        
+        self.assertTrue(self.cpu.execute_cycle())
+        self.assertEqual(self.cpu.register_file.get_register_value_int(1), 5)
+        
+        self.cpu.clear_memory()
+        self.assertEqual(self.cpu.instruction_memory.load_word_int(0), 0)
+
+    def test_patched_hot_loop(self):
+        """Test patching an instruction in an already compiled hot loop takes effect"""
+        loop = (0x00108093,  # ADDI x1, x1, 1
+                0x00110113,  # ADDI x2, x2, 1
+                0xFE000CE3)  # BEQ x0, x0, -8
+        for i, instruction in enumerate(loop):
+            self.cpu.instruction_memory.store_word_int(i * 4, instruction)
+        self.cpu.run_program(max_cycles=60)  # 20 iterations: well past the block threshold
+
+        self.cpu.instruction_memory.store_word_int(4, 0x00118193)  # ADDI x3, x3, 1
+        self.cpu.pc = 0
+        self.cpu.halt = False
+        self.cpu.run_program(max_cycles=120)
+
+        registers = self.cpu.register_file
+        self.assertEqual(registers.get_register_value_int(1), 60)
+        self.assertEqual(registers.get_register_value_int(2), 20)
+        self.assertEqual(registers.get_register_value_int(3), 40)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -4,33 +4,30 @@ Tests essential control signal generation
 """
 
 import unittest
-import sys
-import os
 
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from core.control_unit import ControlUnit, ALUOperation
+from core.control_unit import ControlUnit, ControlSignals, ALUOperation, MEM_READ, MEM_TO_REG, REG_WRITE, MEM_WRITE
 
 
 class TestControlUnit(unittest.TestCase):
     
+    # (instruction, reg_write, alu_src_b, mem_read, mem_write, branch, jump, alu_op)
+    ESSENTIAL_CASES = (
+        (0x00500093, True, True, False, False, False, False, ALUOperation.ADD),    # ADDI
+        (0x002081B3, True, False, False, False, False, False, ALUOperation.ADD),   # ADD
+        (0x40110233, True, False, False, False, False, False, ALUOperation.SUB),   # SUB
+        (0x000102B7, True, True, False, False, False, False, ALUOperation.PASS_B), # LUI
+        (0x0032A023, False, True, False, True, False, False, ALUOperation.ADD),    # SW
+        (0x0002A203, True, True, True, False, False, False, ALUOperation.ADD),     # LW
+        (0x00418463, False, False, False, False, True, False, ALUOperation.SUB),   # BEQ
+        (0x0000006F, True, True, False, False, False, True, ALUOperation.PASS_B),  # JAL
+    )
+    
     def setUp(self):
         self.control_unit = ControlUnit()
     
     def test_essential_control_signals(self):
         """Test control signal generation for essential instructions"""
-        test_cases = [
-            # (instruction, reg_write, alu_src_b, mem_read, mem_write, branch, jump, alu_op)
-            (0x00500093, True, True, False, False, False, False, ALUOperation.ADD),    # ADDI
-            (0x002081B3, True, False, False, False, False, False, ALUOperation.ADD),   # ADD
-            (0x40110233, True, False, False, False, False, False, ALUOperation.SUB),   # SUB
-            (0x000102B7, True, True, False, False, False, False, ALUOperation.PASS_B), # LUI
-            (0x0032A023, False, True, False, True, False, False, ALUOperation.ADD),    # SW
-            (0x0002A203, True, True, True, False, False, False, ALUOperation.ADD),     # LW
-            (0x00418463, False, False, False, False, True, False, ALUOperation.SUB),   # BEQ
-            (0x0000006F, True, True, False, False, False, True, ALUOperation.PASS_B),  # JAL
-        ]
-        
-        for instruction, exp_reg_write, exp_alu_src_b, exp_mem_read, exp_mem_write, exp_branch, exp_jump, exp_alu_op in test_cases:
+        for instruction, exp_reg_write, exp_alu_src_b, exp_mem_read, exp_mem_write, exp_branch, exp_jump, exp_alu_op in self.ESSENTIAL_CASES:
             with self.subTest(instruction=hex(instruction)):
                 decoded, control = self.control_unit.decode_and_control(instruction)
                 
@@ -59,7 +56,59 @@ class TestControlUnit(unittest.TestCase):
         self.assertFalse(control.mem_read)
         self.assertFalse(control.mem_write)
         self.assertEqual(control.alu_op, ALUOperation.ADD)
+    
+    def test_decode_cache(self):
+        """Test repeated instruction words are served from the decode cache"""
+        first = self.control_unit.decode_and_control(0x00500093)   # ADDI x1, x0, 5
+        second = self.control_unit.decode_and_control(0x00500093)
+        self.assertIs(first[0], second[0])
+        self.assertIs(first[1], second[1])
+        with self.assertRaises(AttributeError):
+            first[0].rd = 2  # Cached decodes are shared, so they cannot be modified
+        
+        _, other = self.control_unit.decode_and_control(0x0032A023)  # SW x3, 0(x5)
+        self.assertTrue(other.mem_write)
+    
+    def test_packed_control_signals(self):
+        """Test control signals pack into one int and round-trip through the named fields"""
+        _, control = self.control_unit.decode_and_control(0x0002A203)  # LW x4, 0(x5)
+        self.assertIsInstance(control, int)
+        self.assertTrue(control & MEM_READ and control & MEM_TO_REG and control & REG_WRITE)
+        self.assertFalse(control & MEM_WRITE)
+        
+        signals = ControlSignals(branch=True, pc_src=True, alu_op=ALUOperation.PASS_B)
+        self.assertEqual(signals.alu_op, ALUOperation.PASS_B)
+        self.assertTrue(signals.branch and signals.pc_src)
+        self.assertFalse(signals.reg_write or signals.jump)
+    
+    def test_compile_block(self):
+        """Test a straight-line ALU run compiles to one function that stops before memory access"""
+        words = [0x00500093,  # ADDI x1, x0, 5
+                 0x00A00113,  # ADDI x2, x0, 10
+                 0x002081B3,  # ADD x3, x1, x2
+                 0x40110233,  # SUB x4, x2, x1
+                 0x0032A023]  # SW x3, 0(x5) - ends the block
+        function, count = self.control_unit.compile_block(words)
+        self.assertEqual(count, 4)
+        
+        registers = [0] * 32
+        function(registers)
+        self.assertEqual(registers[1:5], [5, 10, 15, 5])
+        self.assertIsNone(self.control_unit.compile_block([0x0032A023]))
+    
+    def test_compile_block_branch(self):
+        """Test a conditional branch after the ALU run ends the block and selects the next PC offset"""
+        words = [0x00108093,  # ADDI x1, x1, 1
+                 0xFE209EE3]  # BNE x1, x2, -4
+        function, count = self.control_unit.compile_block(words)
+        self.assertEqual(count, 2)
+        
+        registers = [0] * 32
+        registers[2] = 3
+        self.assertEqual(function(registers), 0)  # x1 = 1 != 3: taken back to the ADDI
+        registers[1] = 2
+        self.assertEqual(function(registers), 4)  # x1 = 3: not taken, PC stays on the branch
 
 
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -107,8 +107,7 @@ def test_individual_instructions():
     """Test individual instruction execution"""
     print("\n=== Testing Individual Instructions ===")
     
-    cpu = SingleCycleDatapath()
-    cpu.set_debug_mode(False)  # Reduce noise for this test
+    cpu = SingleCycleDatapath()  # Debug output is off by default
     
     # Test ADD instruction: x1 = x2 + x3
     print("\n1. Testing ADD instruction...")
@@ -143,7 +142,7 @@ def test_individual_instructions():
     addi_instruction = 0x06410213  # ADDI x4, x2, 100
     
     # Reset PC and load instruction
-    cpu.pc = cpu._int_to_bits(0)
+    cpu.pc = 0
     cpu.instruction_memory.store_word(cpu._int_to_bits(0), cpu._int_to_bits(addi_instruction))
     
     # Execute one cycle
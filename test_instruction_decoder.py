@@ -4,36 +4,58 @@ Tests essential functionality with test_base.hex instructions
 """
 
 import unittest
-import sys
-import os
 
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from core.instruction_decoder import InstructionDecoder, InstructionType
 
 
 class TestInstructionDecoder(unittest.TestCase):
     
+    # (instruction, operation, instruction_type)
+    ESSENTIAL_CASES = (
+        (0x00500093, 'ADDI', InstructionType.I_TYPE),   # ADDI x1, x0, 5
+        (0x002081B3, 'ADD', InstructionType.R_TYPE),    # ADD x3, x1, x2
+        (0x40110233, 'SUB', InstructionType.R_TYPE),    # SUB x4, x2, x1
+        (0x000102B7, 'LUI', InstructionType.U_TYPE),    # LUI x5, 16
+        (0x0032A023, 'SW', InstructionType.S_TYPE),     # SW x3, 0(x5)
+        (0x0002A203, 'LW', InstructionType.I_TYPE),     # LW x4, 0(x5)
+        (0x00418463, 'BEQ', InstructionType.B_TYPE),    # BEQ x3, x4, 8
+        (0x0000006F, 'JAL', InstructionType.J_TYPE),    # JAL x0, 0
+    )
+    
     def setUp(self):
         self.decoder = InstructionDecoder()
     
     def test_essential_instructions(self):
         """Test essential instruction types from test_base.hex"""
-        test_cases = [
-            (0x00500093, 'ADDI', InstructionType.I_TYPE),   # ADDI x1, x0, 5
-            (0x002081B3, 'ADD', InstructionType.R_TYPE),    # ADD x3, x1, x2
-            (0x40110233, 'SUB', InstructionType.R_TYPE),    # SUB x4, x2, x1
-            (0x000102B7, 'LUI', InstructionType.U_TYPE),    # LUI x5, 16
-            (0x0032A023, 'SW', InstructionType.S_TYPE),     # SW x3, 0(x5)
-            (0x0002A203, 'LW', InstructionType.I_TYPE),     # LW x4, 0(x5)
-            (0x00418463, 'BEQ', InstructionType.B_TYPE),    # BEQ x3, x4, 8
-            (0x0000006F, 'JAL', InstructionType.J_TYPE),    # JAL x0, 0
-        ]
+        # One comparison of the whole table; a failure reports the first differing index
+        expected = [(hex(instruction), op, inst_type) for instruction, op, inst_type in self.ESSENTIAL_CASES]
+        actual = []
+        for instruction, _, _ in self.ESSENTIAL_CASES:
+            decoded = self.decoder.decode(instruction)
+            actual.append((hex(instruction), decoded['operation'], decoded['instruction_type']))
+        self.assertEqual(actual, expected)
+    
+    def test_illegal_and_shared_entries(self):
+        """Test table misses decode as ILLEGAL and equal (opcode, func3, func7) share one entry"""
+        self.assertEqual(self.decoder.decode(0xFFFFFFFF)['operation'], 'ILLEGAL')
+        self.assertEqual(self.decoder.decode(0x02208233)['operation'], 'MUL')  # MUL x4, x1, x2
+        
+        addi_a = self.decoder.decode(0x00500093)  # ADDI x1, x0, 5
+        addi_b = self.decoder.decode(0xFFF10113)  # ADDI x2, x2, -1
+        self.assertIs(addi_a.info, addi_b.info)
+        self.assertEqual(addi_b['immediate'], -1)
+        self.assertEqual(addi_b.immediate_word, 0xFFFFFFFF)
+    
+    def test_decode_batch(self):
+        """Test batch decode matches per-instruction decode field by field"""
+        words = [0x00500093, 0x002081B3, 0x40110233, 0x000102B7, 0x0032A023,
+                 0x0002A203, 0x00418463, 0x0000006F, 0xFE000EE3, 0xFFFFFFFF]
+        batch = self.decoder.decode_batch(words)
         
-        for instruction, exp_op, exp_type in test_cases:
-            with self.subTest(instruction=hex(instruction)):
-                decoded = self.decoder.decode(instruction)
-                self.assertEqual(decoded['operation'], exp_op)
-                self.assertEqual(decoded['instruction_type'], exp_type)
+        for i, word in enumerate(words):
+            decoded = self.decoder.decode(word)
+            for field in batch._fields:
+                self.assertEqual(getattr(batch, field)[i], decoded[field], f"{field} mismatch for {hex(word)}")
     
     def test_format_instruction(self):
         """Test instruction formatting"""
@@ -3,21 +3,26 @@ Simplified Instruction Format Tests - 4 Essential Tests
 """
 
 import unittest
-import sys
-import os
 
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from core.instruction_decoder import InstructionDecoder, InstructionType, ExtensionType
 
 class TestInstructionFormats(unittest.TestCase):
-    def setUp(self):
-        self.decoder = InstructionDecoder()
+    # Instruction words under test, decoded once for the whole class
+    WORDS = {
+        'ADD': 0x003100B3,   # ADD x1, x2, x3
+        'ADDI': 0x00500093,  # ADDI x1, x0, 5
+        'SW': 0x00102023,    # SW x1, 0(x0)
+        'BEQ': 0x00208063,   # BEQ x1, x2, 0
+    }
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.decoder = InstructionDecoder()
+        cls.decoded = {name: cls.decoder.decode(word) for name, word in cls.WORDS.items()}
     
     def test_r_type_instructions(self):
         """Test R-type instruction decoding"""
-        # ADD x1, x2, x3
-        instruction = 0x003100B3
-        decoded = self.decoder.decode(instruction)
+        decoded = self.decoded['ADD']  # ADD x1, x2, x3
         
         self.assertEqual(decoded['instruction_type'], InstructionType.R_TYPE)
         self.assertEqual(decoded['operation'], "ADD")
@@ -27,9 +32,7 @@ class TestInstructionFormats(unittest.TestCase):
     
     def test_i_type_instructions(self):
         """Test I-type instruction decoding"""
-        # ADDI x1, x0, 5
-        instruction = 0x00500093
-        decoded = self.decoder.decode(instruction)
+        decoded = self.decoded['ADDI']  # ADDI x1, x0, 5
         
         self.assertEqual(decoded['instruction_type'], InstructionType.I_TYPE)
         self.assertEqual(decoded['operation'], "ADDI")
@@ -39,9 +42,7 @@ class TestInstructionFormats(unittest.TestCase):
     
     def test_s_type_instructions(self):
         """Test S-type instruction decoding"""
-        # SW x1, 0(x0)
-        instruction = 0x00102023
-        decoded = self.decoder.decode(instruction)
+        decoded = self.decoded['SW']  # SW x1, 0(x0)
         
         self.assertEqual(decoded['instruction_type'], InstructionType.S_TYPE)
         self.assertEqual(decoded['operation'], "SW")
@@ -51,9 +52,7 @@ class TestInstructionFormats(unittest.TestCase):
     
     def test_b_type_instructions(self):
         """Test B-type instruction decoding"""
-        # BEQ x1, x2, 0
-        instruction = 0x00208063
-        decoded = self.decoder.decode(instruction)
+        decoded = self.decoded['BEQ']  # BEQ x1, x2, 0
         
         self.assertEqual(decoded['instruction_type'], InstructionType.B_TYPE)
         self.assertEqual(decoded['operation'], "BEQ")
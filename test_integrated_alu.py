@@ -3,12 +3,10 @@ Simplified Integrated ALU Tests - 4 Essential Tests
 """
 
 import unittest
-import sys
-import os
 
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from core.integrated_alu import IntegratedALU
 from core.control_unit import ALUOperation
+from utils import word_to_bits, bits_to_word
 # Use utility functions directly in the test class
 
 class TestIntegratedALU(unittest.TestCase):
@@ -17,74 +15,96 @@ class TestIntegratedALU(unittest.TestCase):
     
     def _int_to_bits(self, value: int, width: int = 32):
         """Convert integer to bits"""
-        bits = []
-        for i in range(width-1, -1, -1):
-            bits.append((value >> i) & 1)
-        return bits
+        return word_to_bits(value, width)
     
     def _bits_to_int(self, bits):
         """Convert bits to integer"""
-        result = 0
-        for bit in bits:
-            result = (result << 1) | bit
-        return result
+        return bits_to_word(bits)
     
     def test_arithmetic_operations(self):
         """Test basic arithmetic operations"""
         # Test addition
-        a_bits = self._int_to_bits(10, 32)
-        b_bits = self._int_to_bits(5, 32)
-        result, flags = self.alu.execute(ALUOperation.ADD, a_bits, b_bits)
-        self.assertEqual(self._bits_to_int(result), 15)
+        result, flags = self.alu.execute_int(ALUOperation.ADD, 10, 5)
+        self.assertEqual(result, 15)
         
         # Test subtraction
-        a_bits = self._int_to_bits(10, 32)
-        b_bits = self._int_to_bits(3, 32)
-        result, flags = self.alu.execute(ALUOperation.SUB, a_bits, b_bits)
-        self.assertEqual(self._bits_to_int(result), 7)
+        result, flags = self.alu.execute_int(ALUOperation.SUB, 10, 3)
+        self.assertEqual(result, 7)
     
     def test_logical_operations(self):
         """Test logical operations"""
         # Test AND
-        a_bits = self._int_to_bits(0b1100, 32)
-        b_bits = self._int_to_bits(0b1010, 32)
-        result, flags = self.alu.execute(ALUOperation.AND, a_bits, b_bits)
-        self.assertEqual(self._bits_to_int(result), 0b1000)
+        result, flags = self.alu.execute_int(ALUOperation.AND, 0b1100, 0b1010)
+        self.assertEqual(result, 0b1000)
         
         # Test OR
-        result, flags = self.alu.execute(ALUOperation.OR, a_bits, b_bits)
-        self.assertEqual(self._bits_to_int(result), 0b1110)
+        result, flags = self.alu.execute_int(ALUOperation.OR, 0b1100, 0b1010)
+        self.assertEqual(result, 0b1110)
         
         # Test XOR
-        result, flags = self.alu.execute(ALUOperation.XOR, a_bits, b_bits)
-        self.assertEqual(self._bits_to_int(result), 0b0110)
+        result, flags = self.alu.execute_int(ALUOperation.XOR, 0b1100, 0b1010)
+        self.assertEqual(result, 0b0110)
     
     def test_shift_operations(self):
         """Test shift operations"""
         # Test shift left logical
-        a_bits = self._int_to_bits(5, 32)
-        b_bits = self._int_to_bits(2, 32)
-        result, flags = self.alu.execute(ALUOperation.SLL, a_bits, b_bits)
-        self.assertEqual(self._bits_to_int(result), 20)
+        result, flags = self.alu.execute_int(ALUOperation.SLL, 5, 2)
+        self.assertEqual(result, 20)
         
         # Test shift right logical
-        a_bits = self._int_to_bits(20, 32)
-        b_bits = self._int_to_bits(2, 32)
-        result, flags = self.alu.execute(ALUOperation.SRL, a_bits, b_bits)
-        self.assertEqual(self._bits_to_int(result), 5)
+        result, flags = self.alu.execute_int(ALUOperation.SRL, 20, 2)
+        self.assertEqual(result, 5)
     
     def test_comparison_operations(self):
         """Test comparison operations"""
         # Test set less than
-        a_bits = self._int_to_bits(5, 32)
-        b_bits = self._int_to_bits(10, 32)
-        result, flags = self.alu.execute(ALUOperation.SLT, a_bits, b_bits)
-        self.assertEqual(self._bits_to_int(result), 1)  # 5 < 10 is true
+        result, flags = self.alu.execute_int(ALUOperation.SLT, 5, 10)
+        self.assertEqual(result, 1)  # 5 < 10 is true
+        
+        result, flags = self.alu.execute_int(ALUOperation.SLT, 10, 5)
+        self.assertEqual(result, 0)  # 10 < 5 is false
+        
+        # Opposite-sign operands, where a - b overflows 32 bits
+        result, flags = self.alu.execute_int(ALUOperation.SLT, 0x80000000, 1)
+        self.assertEqual(result, 1)  # INT_MIN < 1
+        
+        result, flags = self.alu.execute_int(ALUOperation.SLT, 0x7FFFFFFF, 0xFFFFFFFF)
+        self.assertEqual(result, 0)  # INT_MAX < -1 is false
         
+        result, flags = self.alu.execute_int(ALUOperation.SLT, 0x7325002C, 0x89F9C60A)
+        self.assertEqual(result, 0)  # positive < negative is false
+    
+    def test_signed_branch_compare(self):
+        """Test BLT/BGE order opposite-sign operands as signed, BLTU/BGEU as unsigned"""
+        compare = self.alu.execute_branch_compare_int
+        self.assertTrue(compare("BLT", 0x80000000, 1))
+        self.assertFalse(compare("BGE", 0x80000000, 1))
+        self.assertFalse(compare("BLT", 0x7FFFFFFF, 0xFFFFFFFF))
+        self.assertTrue(compare("BGE", 0x7FFFFFFF, 0xFFFFFFFF))
+        self.assertFalse(compare("BLTU", 0x80000000, 1))
+        self.assertTrue(compare("BLTU", 0x7FFFFFFF, 0xFFFFFFFF))
+    
+    def test_bit_vector_interface(self):
+        """Test execute accepts and returns 32-bit bit lists, matching execute_int"""
         a_bits = self._int_to_bits(10, 32)
-        b_bits = self._int_to_bits(5, 32)
-        result, flags = self.alu.execute(ALUOperation.SLT, a_bits, b_bits)
-        self.assertEqual(self._bits_to_int(result), 0)  # 10 < 5 is false
+        b_bits = self._int_to_bits(0xFFFFFFFD, 32)  # -3
+        for operation in (ALUOperation.ADD, ALUOperation.SUB, ALUOperation.SLT, ALUOperation.SRL):
+            with self.subTest(operation=operation):
+                result, flags = self.alu.execute(operation, a_bits, b_bits)
+                self.assertEqual(len(result), 32)
+                self.assertEqual((self._bits_to_int(result), flags),
+                                 self.alu.execute_int(operation, 10, 0xFFFFFFFD))
+    
+    def test_flags(self):
+        """Test N, Z, C, V flags from arithmetic and logic operations"""
+        result, flags = self.alu.execute_int(ALUOperation.ADD, 0x7FFFFFFF, 1)
+        self.assertEqual((flags.N, flags.Z, flags.C, flags.V), (1, 0, 0, 1))  # signed overflow
+        
+        result, flags = self.alu.execute_int(ALUOperation.SUB, 5, 5)
+        self.assertEqual((flags.N, flags.Z, flags.C, flags.V), (0, 1, 1, 0))  # no borrow
+        
+        result, flags = self.alu.execute_int(ALUOperation.AND, 0xF0, 0x0F)
+        self.assertEqual(flags, (0, 1, 0, 0))
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
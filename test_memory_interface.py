@@ -3,11 +3,9 @@ Simplified Memory Interface Tests - 4 Essential Tests
 """
 
 import unittest
-import sys
-import os
 
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from core.memory_interface import MemoryInterface
+from utils import word_to_bits, bits_to_word
 # Use utility functions directly in the test class
 
 class TestMemoryInterface(unittest.TestCase):
@@ -16,25 +14,17 @@ class TestMemoryInterface(unittest.TestCase):
     
     def _int_to_bits(self, value: int, width: int = 32):
         """Convert integer to bits"""
-        bits = []
-        for i in range(width-1, -1, -1):
-            bits.append((value >> i) & 1)
-        return bits
+        return word_to_bits(value, width)
     
     def _bits_to_int(self, bits):
         """Convert bits to integer"""
-        result = 0
-        for bit in bits:
-            result = (result << 1) | bit
-        return result
+        return bits_to_word(bits)
     
     def test_memory_initialization(self):
         """Test memory initializes to zero"""
         # Check various memory locations
         for addr in [0x0, 0x100, 0x1000, 0x2000]:
-            addr_bits = self._int_to_bits(addr, 32)
-            result = self.memory.load_word(addr_bits)
-            self.assertEqual(self._bits_to_int(result), 0)
+            self.assertEqual(self.memory.load_word_int(addr), 0)
     
     def test_word_operations(self):
         """Test word store and load operations"""
@@ -42,28 +32,22 @@ class TestMemoryInterface(unittest.TestCase):
         test_values = [0x12345678, 0xABCDEF00, 0x7FFFFFFF, 0x80000000]
         
         for value in test_values:
-            addr_bits = self._int_to_bits(address, 32)
-            value_bits = self._int_to_bits(value, 32)
-            self.memory.store_word(addr_bits, value_bits)
-            loaded_bits = self.memory.load_word(addr_bits)
-            loaded_value = self._bits_to_int(loaded_bits)
-            self.assertEqual(loaded_value, value)
+            self.memory.store_word_int(address, value)
+            self.assertEqual(self.memory.load_word_int(address), value)
             address += 4
     
     def test_byte_operations(self):
         """Test byte store and load operations"""
-        address = 0x2000
-        test_values = [0x12, 0xAB, 0x7F, 0x80]
+        payload = bytes([0x12, 0xAB, 0x7F, 0x80])
+        self.memory.store_bytes_int(0x2000, payload)
+        self.assertEqual(self.memory.load_bytes_int(0x2000, 4), payload)
+        self.assertEqual(self.memory.load_word_int(0x2000), 0x12AB7F80)  # byte 0 is bits 31:24
         
-        for value in test_values:
-            addr_bits = self._int_to_bits(address, 32)
-            # Store_byte expects 32-bit data, takes bottom 8 bits
-            value_bits = self._int_to_bits(value, 32)
-            self.memory.store_byte(addr_bits, value_bits)
-            loaded_bits = self.memory.load_byte(addr_bits, True)
-            loaded_value = self._bits_to_int(loaded_bits)
-            self.assertEqual(loaded_value, value)
-            address += 1
+        # Unaligned runs go byte by byte, also past the dense store
+        for address in (0x2005, self.memory.size_bytes - 2):
+            self.memory.store_bytes_int(address, payload)
+            self.assertEqual(self.memory.load_bytes_int(address, 4), payload)
+            self.assertEqual([self.memory.load_byte_int(address + i, True) for i in range(4)], list(payload))
     
     def test_memory_independence(self):
         """Test that different memory locations are independent"""
@@ -72,16 +56,55 @@ class TestMemoryInterface(unittest.TestCase):
         values = [0x11111111, 0x22222222, 0x33333333, 0x44444444]
         
         for addr, value in zip(addresses, values):
-            addr_bits = self._int_to_bits(addr, 32)
-            value_bits = self._int_to_bits(value, 32)
-            self.memory.store_word(addr_bits, value_bits)
+            self.memory.store_word_int(addr, value)
         
         # Verify each location has the correct value
-        for addr, expected_value in zip(addresses, values):
-            addr_bits = self._int_to_bits(addr, 32)
-            loaded_bits = self.memory.load_word(addr_bits)
-            loaded_value = self._bits_to_int(loaded_bits)
-            self.assertEqual(loaded_value, expected_value)
+        self.assertEqual([self.memory.load_word_int(addr) for addr in addresses], values)
+    
+    def test_bit_vector_interface(self):
+        """Test the bit-list load/store methods round-trip through the word store"""
+        addr_bits = self._int_to_bits(0x1000, 32)
+        self.memory.store_word(addr_bits, self._int_to_bits(0xDEADBEEF, 32))
+        self.assertEqual(self._bits_to_int(self.memory.load_word(addr_bits)), 0xDEADBEEF)
+        self.assertEqual(self.memory.load_word_int(0x1000), 0xDEADBEEF)
+        
+        # Store_byte expects 32-bit data, takes bottom 8 bits
+        byte_addr_bits = self._int_to_bits(0x2003, 32)
+        self.memory.store_byte(byte_addr_bits, self._int_to_bits(0x180, 32))
+        self.assertEqual(self._bits_to_int(self.memory.load_byte(byte_addr_bits, True)), 0x80)
+        self.assertEqual(self._bits_to_int(self.memory.load_byte(byte_addr_bits)), 0xFFFFFF80)
+    
+    def test_word_level_access(self):
+        """Test int-based halfword/byte access within a big-endian word"""
+        self.memory.store_word_int(0x100, 0x8001FF7F)
+        self.assertEqual(self.memory.load_halfword_int(0x100), 0xFFFF8001)
+        self.assertEqual(self.memory.load_halfword_int(0x102, unsigned=True), 0xFF7F)
+        self.assertEqual(self.memory.load_byte_int(0x102), 0xFFFFFFFF)
+        self.assertEqual(self.memory.load_byte_int(0x103), 0x7F)
+        
+        self.memory.store_byte_int(0x101, 0x1234)
+        self.memory.store_halfword_int(0x102, 0xABCD)
+        self.assertEqual(self.memory.load_word_int(0x100), 0x8034ABCD)
+    
+    def test_clear(self):
+        """Test clear zeroes dense and out-of-range words without resizing"""
+        self.memory.store_word_int(0x100, 0x12345678)
+        self.memory.store_word_int(0x10000, 0x9ABCDEF0)  # beyond the dense store
+        self.memory.clear()
+        self.assertEqual(self.memory.load_word_int(0x100), 0)
+        self.assertEqual(self.memory.load_word_int(0x10000), 0)
+        self.assertEqual(len(self.memory.memory), self.memory.size_words)
+    
+    def test_read_words(self):
+        """Test read_words returns ints across the dense store and beyond it"""
+        self.memory.store_word_int(0x0, 0xDEADBEEF)
+        self.memory.store_word_int(0x8, 0x00000001)
+        self.assertEqual(self.memory.read_words(0, 3), [0xDEADBEEF, 0, 1])
+        
+        last = self.memory.size_words - 1
+        self.memory.store_word_int(last * 4, 0x11111111)
+        self.memory.store_word_int((last + 1) * 4, 0x22222222)  # first sparse word
+        self.assertEqual(self.memory.read_words(last, 3), [0x11111111, 0x22222222, 0])
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -3,33 +3,48 @@ Test RISC-V CPU components with prog.hex program
 Loads and processes all instructions from prog.hex file
 """
 
+import os
+from collections import Counter
 from core.instruction_decoder import InstructionDecoder
 from core.control_unit import ControlUnit
 
+# Per-instruction listing is opt-in (PROGHEX_VERBOSE=1); the summary always prints
+VERBOSE = bool(os.environ.get('PROGHEX_VERBOSE'))
+
+# Neither holds per-program state (the control unit's decode cache is keyed by word),
+# so one of each serves every call
+_DECODER = InstructionDecoder()
+_CONTROL = ControlUnit()
+
 def load_prog_hex():
     """Load instructions from prog.hex file"""
-    instructions = []
     try:
         with open('prog.hex', 'r') as f:
-            for line_num, line in enumerate(f, 1):
-                line = line.strip()
-                if line and not line.startswith('#'):
-                    try:
-                        instruction = int(line, 16)
-                        instructions.append(instruction)
-                    except ValueError:
-                        print(f"Warning: Invalid hex instruction on line {line_num}: {line}")
+            lines = [(line_num, line.strip()) for line_num, line in enumerate(f.read().splitlines(), 1)]
     except FileNotFoundError:
         print("Error: prog.hex file not found")
         return []
     
+    lines = [(line_num, line) for line_num, line in lines if line and not line.startswith('#')]
+    try:
+        # Common case: every line parses, converted in one pass
+        return [int(line, 16) for _, line in lines]
+    except ValueError:
+        pass
+    
+    # Some line is malformed: keep the valid ones and report the rest together
+    instructions = []
+    invalid = []
+    for line_num, line in lines:
+        try:
+            instructions.append(int(line, 16))
+        except ValueError:
+            invalid.append((line_num, line))
+    print("\n".join(f"Warning: Invalid hex instruction on line {line_num}: {line}" for line_num, line in invalid))
     return instructions
 
 def test_prog_hex():
     """Test decoder and control unit with prog.hex instructions"""
-    decoder = InstructionDecoder()
-    control_unit = ControlUnit()
-    
     instructions = load_prog_hex()
     if not instructions:
         print("No valid instructions found in prog.hex")
@@ -39,35 +54,41 @@ def test_prog_hex():
     print("=" * 60)
     
     # Track instruction statistics
-    instruction_types = {}
-    alu_operations = {}
+    instruction_types = Counter()
+    alu_operations = Counter()
     control_stats = {
         'reg_writes': 0, 'mem_reads': 0, 'mem_writes': 0, 
         'branches': 0, 'jumps': 0
     }
     
+    # Formatted text per instruction word; loops repeat the same words
+    formatted_cache = {}
+    
     for i, instruction in enumerate(instructions, 1):
-        # Decode instruction
-        decoded = decoder.decode(instruction)
-        formatted = decoder.format_instruction(decoded)
-        
-        # Generate control signals
-        control = control_unit.generate_control_signals(decoded)
+        # Decode instruction and generate control signals (cached per word by the control unit)
+        decoded, control = _CONTROL.decode_and_control(instruction)
         
         # Update statistics
         inst_type = decoded['instruction_type'].value
-        instruction_types[inst_type] = instruction_types.get(inst_type, 0) + 1
+        instruction_types[inst_type] += 1
         
         alu_op = control.alu_op.name
-        alu_operations[alu_op] = alu_operations.get(alu_op, 0) + 1
+        alu_operations[alu_op] += 1
+        
+        # Signals are bools, so they add as 0/1
+        control_stats['reg_writes'] += control.reg_write
+        control_stats['mem_reads'] += control.mem_read
+        control_stats['mem_writes'] += control.mem_write
+        control_stats['branches'] += control.branch
+        control_stats['jumps'] += control.jump
         
-        if control.reg_write: control_stats['reg_writes'] += 1
-        if control.mem_read: control_stats['mem_reads'] += 1
-        if control.mem_write: control_stats['mem_writes'] += 1
-        if control.branch: control_stats['branches'] += 1
-        if control.jump: control_stats['jumps'] += 1
+        if not VERBOSE:
+            continue
         
         # Display instruction details
+        formatted = formatted_cache.get(instruction)
+        if formatted is None:
+            formatted = formatted_cache[instruction] = _DECODER.format_instruction(decoded)
         print(f"Instruction {i:2d}: 0x{instruction:08X} - {formatted}")
         print(f"  Type: {inst_type}, Extension: {decoded['extension'].value}")
         print(f"  Control: reg_write={control.reg_write}, alu_op={alu_op}, "
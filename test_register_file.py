@@ -3,10 +3,7 @@ Simplified Register File Tests - 4 Essential Tests
 """
 
 import unittest
-import sys
-import os
 
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from core.register_file import RegisterFile
 
 class TestRegisterFile(unittest.TestCase):
@@ -15,8 +12,7 @@ class TestRegisterFile(unittest.TestCase):
     
     def test_register_initialization(self):
         """Test that all registers initialize to zero"""
-        for i in range(32):
-            self.assertEqual(self.reg_file.get_register_value_int(i), 0)
+        self.assertEqual(self.reg_file.snapshot_int(), [0] * 32)
     
     def test_x0_hardwired_zero(self):
         """Test that x0 is always zero regardless of write attempts"""
@@ -42,10 +38,8 @@ class TestRegisterFile(unittest.TestCase):
         self.reg_file.set_register_value_int(2, 200)
         self.reg_file.set_register_value_int(3, 300)
         
-        # Verify each register has the correct value
-        self.assertEqual(self.reg_file.get_register_value_int(1), 100)
-        self.assertEqual(self.reg_file.get_register_value_int(2), 200)
-        self.assertEqual(self.reg_file.get_register_value_int(3), 300)
+        # Verify each register has the correct value and no other register changed
+        self.assertEqual(self.reg_file.snapshot_int(), [0, 100, 200, 300] + [0] * 28)
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -9,9 +9,11 @@ from .mdu import mdu_mul
 from .mdu_div import mdu_div
 from .shifter import shifter
 from .twos_complement import encode_twos_complement, decode_twos_complement, sign_extend, zero_extend
+from .word import Word, WORD_MASK, bits_to_word, word_to_bits, word_to_signed
 
 __all__ = [
     'Bits', 'zero_bits', 'left_pad', 'add_rca', 'bits_to_hex',
     'alu', 'mdu_mul', 'mdu_div', 'shifter',
-    'encode_twos_complement', 'decode_twos_complement', 'sign_extend', 'zero_extend'
+    'encode_twos_complement', 'decode_twos_complement', 'sign_extend', 'zero_extend',
+    'Word', 'WORD_MASK', 'bits_to_word', 'word_to_bits', 'word_to_signed'
 ]
\ No newline at end of file
@@ -21,6 +21,9 @@ FRM_RUP = [0,1,1]  # Round Up (+∞)
 FRM_RMM = [1,0,0]  # Round to Nearest, ties to Max Magnitude
 # 101–111 are reserved (leave unused)
 
+# Result-dict flag names and their positions in fflags [NV,DZ,OF,UF,NX]
+_FFLAG_POSITIONS = (("invalid", 0), ("divide_by_zero", 1), ("overflow", 2), ("underflow", 3), ("inexact", 4))
+
 def _bits3(x: List[int]) -> Bits:
     return [x[0], x[1], x[2]]
 
@@ -49,12 +52,11 @@ def fcsr_set_rounding(fcsr: Dict[str, Bits], frm_bits3: Bits) -> None:
 
 def fcsr_get_rounding(fcsr: Dict[str, Bits]) -> Bits:
     """Get rounding mode (3 bits)."""
-    return [fcsr["frm"][0], fcsr["frm"][1], fcsr["frm"][2]]
+    return fcsr["frm"][:]
 
 def fcsr_read_fflags(fcsr: Dict[str, Bits]) -> Bits:
     """Read 5-bit fflags as [NV,DZ,OF,UF,NX] (MSB..LSB of the 5-bit field)."""
-    ff = fcsr["fflags"]
-    return [ff[0], ff[1], ff[2], ff[3], ff[4]]
+    return fcsr["fflags"][:]
 
 def fcsr_write_fflags(fcsr: Dict[str, Bits], flags5: Bits) -> None:
     """Write 5-bit fflags (overwrites current)."""
@@ -71,16 +73,7 @@ def fcsr_accumulate(fcsr: Dict[str, Bits], flags: Dict[str,int]) -> None:
     Unknown/missing keys are ignored.
     """
     ff = fcsr["fflags"]  # [NV,DZ,OF,UF,NX]
-    # map dict -> bit positions
-    nv = 1 if flags.get("invalid", 0) == 1 else 0
-    dz = 1 if flags.get("divide_by_zero", 0) == 1 else 0
-    of = 1 if flags.get("overflow", 0) == 1 else 0
-    uf = 1 if flags.get("underflow", 0) == 1 else 0
-    nx = 1 if flags.get("inexact", 0) == 1 else 0
-
-    # sticky OR
-    ff[0] = 1 if (ff[0] == 1 or nv == 1) else 0
-    ff[1] = 1 if (ff[1] == 1 or dz == 1) else 0
-    ff[2] = 1 if (ff[2] == 1 or of == 1) else 0
-    ff[3] = 1 if (ff[3] == 1 or uf == 1) else 0
-    ff[4] = 1 if (ff[4] == 1 or nx == 1) else 0
+    # sticky OR: a raised flag sets its bit, anything else leaves the bit as it was
+    for key, pos in _FFLAG_POSITIONS:
+        if flags.get(key, 0) == 1:
+            ff[pos] = 1
@@ -4,16 +4,28 @@ Float32 (IEEE-754 single) bitfield tools — pure bit-vectors.
 This module provides:
   • pack_f32_fields / unpack_f32_fields / classify_f32 / bits_to_hex_str
   • fmul_f32: multiply with normalize + RoundTiesToEven (RNE), specials, flags, trace
+  • fadd_f32 / fsub_f32: add/subtract with alignment + RNE, specials, flags, trace
+
+Each op's "trace" always records step labels (specials, prod_zero, ...); fmul's
+hex "mul:" and "round_rne:" entries only appear when DEBUG_TRACE is True.
+
+The "flags" of every op result is a read-only mapping shared between results
+(overflow / underflow / invalid); copy it with dict(...) to modify it.
 
 Constraints (impl only):
   • no + - * / % << >> on numeric types
   • no int(..., base), bin(), hex(), format() inside the implementation
 """
 
+from types import MappingProxyType
 from typing import Tuple, Dict
-from .bitvec import Bits, zero_bits, add_rca, twos_complement_negate, bits_to_hex
+from .bitvec import Bits, zero_bits, add_rca, invert_bits, twos_complement_negate, bits_to_hex
 from .shifter import shifter
 
+# Set True to record the hex-formatted intermediate values in each op's "trace";
+# step labels (specials, classify, prod_zero) are recorded either way
+DEBUG_TRACE = False
+
 # ---------------- pack/unpack/classify ----------------
 
 def _check_len(bits: Bits, expected: int, label: str):
@@ -25,7 +37,7 @@ def pack_f32_fields(sign: int, exp_bits: Bits, frac_bits: Bits) -> Bits:
         raise ValueError("sign must be 0 or 1")
     _check_len(exp_bits, 8, "exp_bits")
     _check_len(frac_bits, 23, "frac_bits")
-    return [sign] + exp_bits[:] + frac_bits[:]
+    return [sign] + exp_bits + frac_bits
 
 def unpack_f32_fields(bits: Bits) -> Tuple[int, Bits, Bits]:
     if len(bits) != 32:
@@ -35,21 +47,18 @@ def unpack_f32_fields(bits: Bits) -> Tuple[int, Bits, Bits]:
     frac_bits = bits[9:]
     return sign, exp_bits, frac_bits
 
+def _kind_f32(exp_bits: Bits, frac_bits: Bits) -> str:
+    """Kind of already-unpacked fields, so the ops classify without unpacking again."""
+    if 1 not in exp_bits:
+        return "ZERO" if 1 not in frac_bits else "SUBNORMAL"
+    if 0 not in exp_bits:
+        return "INF" if 1 not in frac_bits else "NAN"
+    return "NORMAL"
+
 def classify_f32(bits: Bits) -> Dict[str, int]:
     """Return kind ∈ {ZERO,SUBNORMAL,NORMAL,INF,NAN} and sign."""
     s, e, f = unpack_f32_fields(bits)
-    exp_all_zero = all(b == 0 for b in e)
-    exp_all_one  = all(b == 1 for b in e)
-    frac_zero    = all(b == 0 for b in f)
-    if exp_all_zero and frac_zero:
-        return {"kind": "ZERO", "sign": s}
-    if exp_all_zero and not frac_zero:
-        return {"kind": "SUBNORMAL", "sign": s}
-    if exp_all_one and frac_zero:
-        return {"kind": "INF", "sign": s}
-    if exp_all_one and not frac_zero:
-        return {"kind": "NAN", "sign": s}
-    return {"kind": "NORMAL", "sign": s}
+    return {"kind": _kind_f32(e, f), "sign": s}
 
 def bits_to_hex_str(bits: Bits) -> str:
     return "0x" + bits_to_hex(bits)[-8:]
@@ -58,71 +67,117 @@ def bits_to_hex_str(bits: Bits) -> str:
 
 _BIAS8  = [0,1,1,1,1,1,1,1]          # 127
 _BIAS9  = [0] + _BIAS8               # 9-bit (0|bias)
-_ONE9   = [0,0,0,0,0,0,0,0,1]
-
+_NEG_BIAS9  = twos_complement_negate(_BIAS9)   # -127, negated once at import
+_NEG_2BIAS9 = twos_complement_negate(add_rca(_BIAS9, _BIAS9, 0)[0])   # -254 (both biases in one operand)
+
+# exp+frac of ±Inf and ±0; results are built as [sign] + tail, a fresh list each time
+_INF_TAIL  = [1]*8 + [0]*23
+_ZERO_TAIL = [0]*31
+# Canonical quiet NaN returned by invalid operations; callers get a copy
+_QNAN_BITS = [0] + [1]*8 + [0]*22 + [1]
+# Effective exponent of subnormals (read-only; callers only concatenate it)
+_SUBNORMAL_EXP8 = [0,0,0,0,0,0,0,1]
+
+# Membership tests scan the bit list in C
 def _all_zero(bits: Bits) -> bool:
-    for b in bits:
-        if b == 1: return False
-    return True
+    return 1 not in bits
 
 def _all_one(bits: Bits) -> bool:
-    for b in bits:
-        if b == 0: return False
-    return True
+    return 0 not in bits
 
 def _or_reduce(bits: Bits) -> int:
-    for b in bits:
-        if b == 1: return 1
-    return 0
+    return 1 if 1 in bits else 0
+
+# Shared read-only flag results, one per combination of (overflow, underflow, invalid);
+# every op returns one of these instead of building a dict per call
+_FLAGS_BY_BITS = {
+    (of, uf, nv): MappingProxyType({"overflow":of, "underflow":uf, "invalid":nv})
+    for of in (0, 1) for uf in (0, 1) for nv in (0, 1)
+}
+_FLAGS_CLEAN     = _FLAGS_BY_BITS[0, 0, 0]
+_FLAGS_INVALID   = _FLAGS_BY_BITS[0, 0, 1]
+_FLAGS_OVERFLOW  = _FLAGS_BY_BITS[1, 0, 0]
+_FLAGS_UNDERFLOW = _FLAGS_BY_BITS[0, 1, 0]
+
+def _merge_flags(flags_r, flags_pack):
+    """OR two flag results into the shared mapping for the combined flags"""
+    if flags_pack is flags_r or flags_pack is _FLAGS_CLEAN:
+        return flags_r
+    if flags_r is _FLAGS_CLEAN:
+        return flags_pack
+    return _FLAGS_BY_BITS[flags_r["overflow"] or flags_pack["overflow"],
+                          flags_r["underflow"] or flags_pack["underflow"],
+                          flags_r["invalid"] or flags_pack["invalid"]]
 
 def _zero_extend(bits: Bits, width: int) -> Bits:
     if len(bits) >= width: return bits[-width:]
-    return [0]*(width - len(bits)) + bits[:]
+    return [0]*(width - len(bits)) + bits
 
-def _add_u(a: Bits, b: Bits):
-    s, c = add_rca(a, b, 0)
-    return s, c
+# Unsigned add is the adder itself; no wrapper call on the exponent arithmetic chain
+_add_u = add_rca
 
 def _sub_u(a: Bits, b: Bits):
-    nb = twos_complement_negate(b)
-    s, c = add_rca(a, nb, 0)
-    return s, c
+    # a - b = a + ~b + 1, the +1 riding in as carry-in instead of a separate negate pass
+    return add_rca(a, invert_bits(b), 1)
 
 def _inc_u(bits: Bits):
-    return _add_u(bits, _zero_extend([1], len(bits)))
+    # +1 turns the trailing 1s into 0s and the lowest 0 into a 1; carry out only if all bits were 1
+    out = bits[:]
+    for i in reversed(range(len(out))):
+        if out[i] == 0:
+            out[i] = 1
+            return out, 0
+        out[i] = 0
+    return out, 1
+
+# 9-bit encodings of shift counts 0..48, so a k-bit normalize shift adjusts the exponent with one add
+_COUNT9 = [[0]*9]
+for _ in range(48):
+    _COUNT9.append(_inc_u(_COUNT9[-1])[0])
+# ...and their two's complements, so the subtract is a single add with no per-call negate
+_NEG_COUNT9 = [twos_complement_negate(count9) for count9 in _COUNT9]
 
 def _mul_u(a: Bits, b: Bits, outw: int) -> Bits:
-    acc = [0]*outw
-    mcand = _zero_extend(a, outw)
-    mplier = b[:]
-    steps = len(b)
-    for _ in range(steps):
-        if mplier[-1] == 1:
-            acc, _ = _add_u(acc, mcand)
-        mcand = shifter(mcand, 1, "SLL")
-        mplier = shifter(mplier, 1, "SRL")
-    return acc
+    """
+    Sequential shift-add multiplier: a len(a)-bit accumulator adds the multiplicand
+    for each set multiplier bit (LSB first), then shifts right one place together
+    with its carry; the bit shifted out is the next product bit.
+    """
+    hi = [0]*len(a)
+    lo = []
+    for bit in reversed(b):
+        if bit == 1:
+            hi, carry = _add_u(hi, a)
+        else:
+            carry = 0
+        lo.append(hi[-1])
+        hi = [carry] + hi[:-1]
+    lo.reverse()
+    return _zero_extend(hi + lo, outw)
 
 # ---------------- float32 helpers for multiply ----------------
 
-def _exp_effective(e8: Bits) -> Bits:
-    # treat subnormals (e==0) as exp=1 for significand
-    return [0,0,0,0,0,0,0,1] if _all_zero(e8) else e8[:]
-
-def _make_significand(e8: Bits, frac23: Bits) -> Bits:
-    # hidden=1 if normal, hidden=0 if subnormal/zero
-    hidden = 0 if _all_zero(e8) else 1
-    return [hidden] + frac23[:]
+def _significand_and_exp(kind: str, e8: Bits, frac23: Bits) -> Tuple[Bits, Bits]:
+    """
+    24-bit significand and effective exponent of a finite operand, from its already-computed kind:
+    hidden=1 for normals; subnormals get hidden=0 and are treated as exp=1
+    """
+    if kind == "NORMAL":
+        return [1] + frac23, e8
+    return [0] + frac23, _SUBNORMAL_EXP8
 
-def _add9(a9: Bits, b9: Bits): return _add_u(a9, b9)
-def _sub9(a9: Bits, b9: Bits): return _sub_u(a9, b9)
+_add9 = _add_u
+_sub9 = _sub_u
 
 def _normalize_left(prod: Bits, exp9: Bits):
-    if _all_zero(prod): return prod, exp9
-    for _ in range(len(prod)):
-        if prod[0] == 1: break
-        prod = shifter(prod, 1, "SLL")
-        exp9, _ = _sub9(exp9, _ONE9)
+    # Shift the leading 1 to index 0 in one step; the same scan finds an all-zero prod
+    try:
+        shifts = prod.index(1)
+    except ValueError:
+        return prod, exp9
+    if shifts:
+        prod = shifter(prod, shifts, "SLL")
+        exp9, _ = _add9(exp9, _NEG_COUNT9[shifts])
     return prod, exp9
 
 def _round_rne_24(prod48: Bits, exp9: Bits):
@@ -134,28 +189,24 @@ def _round_rne_24(prod48: Bits, exp9: Bits):
     After normalization, take:
       mant24 = norm[1:25], guard=norm[25], round=norm[26], sticky=OR(norm[27:])
     """
-    flags = {"overflow": 0, "underflow": 0, "invalid": 0}
+    flags = _FLAGS_CLEAN
 
     # 1) Normalize
-    p = prod48[:]   # working copy
+    p = prod48      # every step below builds a new list; prod48 itself is not modified
     e = exp9
 
     if p[0] == 1:
-        # Product in [2,4): shift right once and bump exponent
-        p = shifter(p, 1, "SRL")
-        e, _ = _add9(e, _ONE9)
+        # Product in [2,4): shift right once (as a slice) and bump exponent
+        p = [0] + p[:-1]
+        e, _ = _inc_u(e)
     else:
         # Want top pattern '01' (i.e., p[1] == 1). If not, normalize left.
         if not _all_zero(p):
-            # Shift-left until p[1] == 1 (or we go to zero)
-            # (Up to 48 safe; early-out when found)
-            for _ in range(len(p)):
-                if p[1] == 1:
-                    break
-                p = shifter(p, 1, "SLL")
-                e, _ = _sub9(e, _ONE9)
-                if _all_zero(p):
-                    break
+            # Shift left so the leading 1 lands at p[1], in one step (p[0] is 0 here)
+            shifts = p.index(1) - 1
+            if shifts:
+                p = shifter(p, shifts, "SLL")
+                e, _ = _add9(e, _NEG_COUNT9[shifts])
 
     # Now p should have top bits '01' for normals (or be zero)
     # 2) Extract mantissa + GRS
@@ -173,27 +224,24 @@ def _round_rne_24(prod48: Bits, exp9: Bits):
         if carry == 1:
             # Rounding overflow: renormalize (shift right 1) and bump exponent
             mant24 = [1] + mant24[:-1]
-            e, _ = _add9(e, _ONE9)
+            e, _ = _inc_u(e)
 
     return mant24, e, flags
 
 def _pack_from_mant_exp(sign: int, mant24: Bits, exp9_unbiased: Bits):
     """Pack final 32-bit float. Adds bias, handles overflow→INF and simple underflow→ZERO."""
-    flags = {"overflow":0, "underflow":0, "invalid":0}
     # e_pack = exp_true + bias
     e_pack9, _ = _add9(exp9_unbiased, _BIAS9)
     e_pack8 = e_pack9[-8:]
     # negative exponent (two's complement sign) -> underflow→zero (simplified)
     if e_pack9[0] == 1:
-        flags["underflow"] = 1
-        return [sign] + [0]*8 + [0]*23, flags
+        return [sign] + _ZERO_TAIL, _FLAGS_UNDERFLOW
     # overflow to INF
     if _all_one(e_pack8):
-        flags["overflow"] = 1
-        return [sign] + [1]*8 + [0]*23, flags
+        return [sign] + _INF_TAIL, _FLAGS_OVERFLOW
     # normal
     frac23 = mant24[1:]
-    return [sign] + e_pack8 + frac23, flags
+    return [sign] + e_pack8 + frac23, _FLAGS_CLEAN
 
 # ---------------- main: fmul_f32 ----------------
 
@@ -202,73 +250,62 @@ def fmul_f32(a_bits: Bits, b_bits: Bits) -> Dict[str, object]:
 
     sa, ea, fa = unpack_f32_fields(a_bits)
     sb, eb, fb = unpack_f32_fields(b_bits)
-    ka = classify_f32(a_bits)
-    kb = classify_f32(b_bits)
-
-    # NaN & invalid
-    if ka["kind"] == "NAN":
-        return {"res_bits": a_bits, "flags": {"overflow":0,"underflow":0,"invalid":1}, "trace": ["nan_a"]}
-    if kb["kind"] == "NAN":
-        return {"res_bits": b_bits, "flags": {"overflow":0,"underflow":0,"invalid":1}, "trace": ["nan_b"]}
-    if (ka["kind"] == "ZERO" and kb["kind"] == "INF") or (ka["kind"] == "INF" and kb["kind"] == "ZERO"):
-        qnan = [0] + [1]*8 + ([0]*22 + [1])
-        return {"res_bits": qnan, "flags": {"overflow":0,"underflow":0,"invalid":1}, "trace": ["zero_times_inf"]}
-
-    # Inf/Zero short-circuits
-    if ka["kind"] == "INF" or kb["kind"] == "INF":
-        s = sa ^ sb
-        return {"res_bits": [s] + [1]*8 + [0]*23, "flags": {"overflow":0,"underflow":0,"invalid":0}, "trace": ["inf_times_finite"]}
-    if ka["kind"] == "ZERO" or kb["kind"] == "ZERO":
-        s = sa ^ sb
-        return {"res_bits": [s] + [0]*8 + [0]*23, "flags": {"overflow":0,"underflow":0,"invalid":0}, "trace": ["zero_times_finite"]}
+    ka = _kind_f32(ea, fa)
+    kb = _kind_f32(eb, fb)
+
+    # Two normal operands skip the special-case checks
+    if ka != "NORMAL" or kb != "NORMAL":
+        # NaN & invalid
+        if ka == "NAN":
+            return {"res_bits": a_bits, "flags": _FLAGS_INVALID, "trace": ["nan_a"]}
+        if kb == "NAN":
+            return {"res_bits": b_bits, "flags": _FLAGS_INVALID, "trace": ["nan_b"]}
+        if (ka == "ZERO" and kb == "INF") or (ka == "INF" and kb == "ZERO"):
+            return {"res_bits": _QNAN_BITS[:], "flags": _FLAGS_INVALID, "trace": ["zero_times_inf"]}
+
+        # Inf/Zero short-circuits
+        if ka == "INF" or kb == "INF":
+            s = sa ^ sb
+            return {"res_bits": [s] + _INF_TAIL, "flags": _FLAGS_CLEAN, "trace": ["inf_times_finite"]}
+        if ka == "ZERO" or kb == "ZERO":
+            s = sa ^ sb
+            return {"res_bits": [s] + _ZERO_TAIL, "flags": _FLAGS_CLEAN, "trace": ["zero_times_finite"]}
 
     # significands and effective exponents
-    sigA = _make_significand(ea, fa)       # 24
-    sigB = _make_significand(eb, fb)       # 24
-    eA_eff8 = _exp_effective(ea)
-    eB_eff8 = _exp_effective(eb)
+    sigA, eA_eff8 = _significand_and_exp(ka, ea, fa)   # 24, 8
+    sigB, eB_eff8 = _significand_and_exp(kb, eb, fb)   # 24, 8
 
     # true exponent: (eA-bias) + (eB-bias)  => eA + eB - 2*bias
     eA9 = [0] + eA_eff8
     eB9 = [0] + eB_eff8
     sum9, _ = _add9(eA9, eB9)
-    neg_bias9 = twos_complement_negate(_BIAS9)
-    exp_true9, _ = _add9(sum9, neg_bias9)       # subtract bias once
-    exp_true9, _ = _add9(exp_true9, neg_bias9)  # subtract bias twice
+    exp_true9, _ = _add9(sum9, _NEG_2BIAS9)     # subtract bias twice in one add
 
     # 24x24 -> 48 product
     prod48 = _mul_u(sigA, sigB, 48)
-    trace.append("mul: sigA*sigB -> prod48=0x" + bits_to_hex(prod48)[-12:])
+    if DEBUG_TRACE:
+        trace.append("mul: sigA*sigB -> prod48=0x" + bits_to_hex(prod48)[-12:])
 
     if _all_zero(prod48):
         s = sa ^ sb
-        return {"res_bits": [s] + [0]*8 + [0]*23, "flags": {"overflow":0,"underflow":0,"invalid":0}, "trace": trace + ["prod_zero"]}
+        return {"res_bits": [s] + _ZERO_TAIL, "flags": _FLAGS_CLEAN, "trace": trace + ["prod_zero"]}
 
     mant24, exp_after, flags_r = _round_rne_24(prod48, exp_true9)
-    trace.append("round_rne: mant=" + bits_to_hex(mant24)[-6:] + " exp9=" + bits_to_hex(exp_after)[-2:])
+    if DEBUG_TRACE:
+        trace.append("round_rne: mant=" + bits_to_hex(mant24)[-6:] + " exp9=" + bits_to_hex(exp_after)[-2:])
 
     # pack + flags
     s = sa ^ sb
     out_bits, flags_pack = _pack_from_mant_exp(s, mant24, exp_after)
-    flags = {"overflow":0, "underflow":0, "invalid":0}
-    for k in flags: flags[k] = (flags_r.get(k,0) or flags_pack.get(k,0))
+    flags = _merge_flags(flags_r, flags_pack)
     return {"res_bits": out_bits, "flags": flags, "trace": trace}
 
 # ---------- helpers specifically for add/sub ----------
 
 def _u_ge(a: Bits, b: Bits) -> int:
     """Unsigned >= comparison (same width), MSB..LSB."""
-    for i in range(len(a)):
-        if a[i] != b[i]:
-            return 1 if a[i] > b[i] else 0
-    return 1  # equal
-
-def _sticky_srl_once(bits: Bits, sticky_in: int) -> Tuple[Bits, int]:
-    """Logical SRL by 1, returning (shifted, sticky_out). sticky_out |= dropped LSB."""
-    dropped = bits[-1]
-    out = shifter(bits, 1, "SRL")
-    sticky_out = 1 if (sticky_in == 1 or dropped == 1) else 0
-    return out, sticky_out
+    # Equal-width MSB-first 0/1 lists compare lexicographically exactly like unsigned values
+    return 1 if a >= b else 0
 
 def _align_to_same_exp(sig_big27: Bits, sig_sml27: Bits, e_big8: Bits, e_sml8: Bits) -> Tuple[Bits, Bits, int]:
     """
@@ -276,22 +313,24 @@ def _align_to_same_exp(sig_big27: Bits, sig_sml27: Bits, e_big8: Bits, e_sml8: B
     Precond: e_big8 >= e_sml8 (unsigned compare).
     Returns (big27, sml27_aligned, sticky_on_sml).
     """
-    big = sig_big27[:]
-    sml = sig_sml27[:]
+    big = sig_big27
+    sml = sig_sml27
 
     # compute delta = e_big - e_sml (as 9-bit unsigned) using our adder/sub
     EL9 = [0] + e_big8
     ES9 = [0] + e_sml8
     delta9, _ = _sub9(EL9, ES9)
-
-    sticky = 0
-    # shift sml right 'delta' times; each SRL aggregates sticky
-    # cap to 64 to be safe (beyond 27+ a few, value collapses anyway)
-    for _ in range(64):
-        if _all_zero(delta9):
-            break
-        sml, sticky = _sticky_srl_once(sml, sticky)
-        delta9, _ = _sub9(delta9, _ONE9)
+    if _all_zero(delta9):
+        return big, sml, 0
+
+    # shift sml right by delta in one step; sticky is the OR of the bits shifted out
+    # (deltas past the count table shift every bit out, same as shifting by the full width)
+    try:
+        shifts = _COUNT9.index(delta9)
+    except ValueError:
+        shifts = len(sml)
+    sticky = _or_reduce(sml[-shifts:])
+    sml = shifter(sml, shifts, "SRL")
 
     # ensure the final sticky is recorded in the LSB position
     if sticky == 1:
@@ -300,19 +339,20 @@ def _align_to_same_exp(sig_big27: Bits, sig_sml27: Bits, e_big8: Bits, e_sml8: B
     return big, sml, sticky
 
 def _leading1_index(bits: Bits) -> int:
-    for i, b in enumerate(bits):
-        if b == 1:
-            return i
-    return -1
+    # list.index scans in C
+    try:
+        return bits.index(1)
+    except ValueError:
+        return -1
 
 def _round_rne_from_any(p: Bits, exp9: Bits) -> Tuple[Bits, Bits, Dict[str,int]]:
     """
     Normalize arbitrary-width positive p (MSB..LSB), then round to 24-bit mantissa (hidden+23) with RNE.
     Returns (mant24, exp9_after, flags_delta).
     """
-    flags = {"overflow":0, "underflow":0, "invalid":0}
+    flags = _FLAGS_CLEAN
     e = exp9
-    q = p[:]
+    q = p
 
     lead = _leading1_index(q)
     if lead == -1:
@@ -321,14 +361,13 @@ def _round_rne_from_any(p: Bits, exp9: Bits) -> Tuple[Bits, Bits, Dict[str,int]]
 
     if lead == 0:
         # value in [2,4): keep window at 0.., bump exponent
-        e, _ = _add9(e, _ONE9)
+        e, _ = _inc_u(e)
         start = 0
     elif lead > 1:
         # need to left-normalize so the hidden 1 ends up at index 1
         shifts = lead - 1
-        for _ in range(shifts):
-            q = shifter(q, 1, "SLL")
-            e, _ = _sub9(e, _ONE9)
+        q = shifter(q, shifts, "SLL")
+        e, _ = _add9(e, _NEG_COUNT9[shifts])
         start = 1
     else:
         # lead == 1, already [1,2)
@@ -349,7 +388,7 @@ def _round_rne_from_any(p: Bits, exp9: Bits) -> Tuple[Bits, Bits, Dict[str,int]]
         mant24, carry = _inc_u(mant24)
         if carry == 1:
             mant24 = [1] + mant24[:-1]
-            e, _ = _add9(e, _ONE9)
+            e, _ = _inc_u(e)
 
     return mant24, e, flags
 
@@ -370,46 +409,44 @@ def fadd_f32(a_bits: Bits, b_bits: Bits) -> Dict[str, object]:
     trace = []
     sa, ea, fa = unpack_f32_fields(a_bits)
     sb, eb, fb = unpack_f32_fields(b_bits)
-    ka = classify_f32(a_bits)
-    kb = classify_f32(b_bits)
+    ka = _kind_f32(ea, fa)
+    kb = _kind_f32(eb, fb)
     
     # trace classify
-    from .bitvec import bits_to_hex  # local import for tracing strings
-    trace.append("classify: A=" + ka["kind"] + " B=" + kb["kind"])
-
-    # NaN propagation
-    if ka["kind"] == "NAN":  # qNaN in, return it
-        return {"res_bits": a_bits, "flags": {"overflow":0,"underflow":0,"invalid":1}, "trace": ["nan_a"]}
-    if kb["kind"] == "NAN":
-        return {"res_bits": b_bits, "flags": {"overflow":0,"underflow":0,"invalid":1}, "trace": ["nan_b"]}
-
-    # Infinity rules
-    if ka["kind"] == "INF" and kb["kind"] == "INF":
-        if sa == sb:
-            return {"res_bits": [sa] + [1]*8 + [0]*23, "flags": {"overflow":0,"underflow":0,"invalid":0}, "trace": ["inf+inf"]}
-        # +Inf + -Inf => invalid NaN
-        qnan = [0] + [1]*8 + ([0]*22 + [1])
-        return {"res_bits": qnan, "flags": {"overflow":0,"underflow":0,"invalid":1}, "trace": ["inf+-inf"]}
-    if ka["kind"] == "INF":
-        return {"res_bits": [sa] + [1]*8 + [0]*23, "flags": {"overflow":0,"underflow":0,"invalid":0}, "trace": ["inf+finite"]}
-    if kb["kind"] == "INF":
-        return {"res_bits": [sb] + [1]*8 + [0]*23, "flags": {"overflow":0,"underflow":0,"invalid":0}, "trace": ["finite+inf"]}
-
-    # Zeros: if both zero (any signs) → +0 (per usual default)
-    if ka["kind"] == "ZERO" and kb["kind"] == "ZERO":
-        return {"res_bits": [0] + [0]*8 + [0]*23, "flags": {"overflow":0,"underflow":0,"invalid":0}, "trace": ["zero+zero"]}
-    # If one is zero, return the other
-    if ka["kind"] == "ZERO":
-        return {"res_bits": [sb] + eb + fb, "flags": {"overflow":0,"underflow":0,"invalid":0}, "trace": ["0+x"]}
-    if kb["kind"] == "ZERO":
-        return {"res_bits": [sa] + ea + fa, "flags": {"overflow":0,"underflow":0,"invalid":0}, "trace": ["x+0"]}
+    trace.append("classify: A=" + ka + " B=" + kb)
+
+    # Two normal operands skip the special-case checks
+    if ka != "NORMAL" or kb != "NORMAL":
+        # NaN propagation
+        if ka == "NAN":  # qNaN in, return it
+            return {"res_bits": a_bits, "flags": _FLAGS_INVALID, "trace": ["nan_a"]}
+        if kb == "NAN":
+            return {"res_bits": b_bits, "flags": _FLAGS_INVALID, "trace": ["nan_b"]}
+
+        # Infinity rules
+        if ka == "INF" and kb == "INF":
+            if sa == sb:
+                return {"res_bits": [sa] + _INF_TAIL, "flags": _FLAGS_CLEAN, "trace": ["inf+inf"]}
+            # +Inf + -Inf => invalid NaN
+            return {"res_bits": _QNAN_BITS[:], "flags": _FLAGS_INVALID, "trace": ["inf+-inf"]}
+        if ka == "INF":
+            return {"res_bits": [sa] + _INF_TAIL, "flags": _FLAGS_CLEAN, "trace": ["inf+finite"]}
+        if kb == "INF":
+            return {"res_bits": [sb] + _INF_TAIL, "flags": _FLAGS_CLEAN, "trace": ["finite+inf"]}
+
+        # Zeros: if both zero (any signs) → +0 (per usual default)
+        if ka == "ZERO" and kb == "ZERO":
+            return {"res_bits": [0] + _ZERO_TAIL, "flags": _FLAGS_CLEAN, "trace": ["zero+zero"]}
+        # If one is zero, return the other
+        if ka == "ZERO":
+            return {"res_bits": [sb] + eb + fb, "flags": _FLAGS_CLEAN, "trace": ["0+x"]}
+        if kb == "ZERO":
+            return {"res_bits": [sa] + ea + fa, "flags": _FLAGS_CLEAN, "trace": ["x+0"]}
 
     # Build effective exponents and 24-bit significands
     # For normals: hidden=1; for subnormals: hidden=0; effective exponent is 1 for subnormals.
-    eA_eff8 = _exp_effective(ea)
-    eB_eff8 = _exp_effective(eb)
-    sigA24  = _make_significand(ea, fa)   # 24
-    sigB24  = _make_significand(eb, fb)   # 24
+    sigA24, eA_eff8 = _significand_and_exp(ka, ea, fa)   # 24, 8
+    sigB24, eB_eff8 = _significand_and_exp(kb, eb, fb)   # 24, 8
 
     # Decide which has larger magnitude (exp, then significand)
     if _u_ge(eA_eff8, eB_eff8):
@@ -429,8 +466,7 @@ def fadd_f32(a_bits: Bits, b_bits: Bits) -> Dict[str, object]:
     sigL27, sigS27_aligned, _sticky = _align_to_same_exp(sigL27, sigS27, eL8, eS8)
     # Use UNBIASED exponent frame: exp_true9 = eL8 - bias
     EL9 = [0] + eL8
-    neg_bias9 = twos_complement_negate(_BIAS9)
-    exp_true9, _ = _add9(EL9, neg_bias9)
+    exp_true9, _ = _add9(EL9, _NEG_BIAS9)
 
 
     # Determine operation (add vs subtract) in significand space
@@ -447,19 +483,17 @@ def fadd_f32(a_bits: Bits, b_bits: Bits) -> Dict[str, object]:
         # Subtract: |L| - |S|
         # If magnitudes equal after alignment, result is +0
         if sigL27 == sigS27_aligned:
-            return {"res_bits": [0] + [0]*8 + [0]*23, "flags": {"overflow":0,"underflow":0,"invalid":0}, "trace": ["cancel_to_zero"]}
+            return {"res_bits": [0] + _ZERO_TAIL, "flags": _FLAGS_CLEAN, "trace": ["cancel_to_zero"]}
         p28_L = [0] + sigL27
-        # twos-complement negate of smaller (28-bit)
+        # subtract smaller (28-bit) via its two's complement
         p28_S = [0] + sigS27_aligned
-        neg_S  = twos_complement_negate(p28_S)
-        diff28, _ = _add_u(p28_L, neg_S)
+        diff28, _ = _sub_u(p28_L, p28_S)
         mant24, exp_after, flags_r = _round_rne_from_any(diff28, exp_true9)
         sign_res = sL
 
     # Pack + merge flags
     out_bits, flags_pack = _pack_from_mant_exp(sign_res, mant24, exp_after)
-    flags = {"overflow":0,"underflow":0,"invalid":0}
-    for k in flags: flags[k] = (flags_r.get(k,0) or flags_pack.get(k,0))
+    flags = _merge_flags(flags_r, flags_pack)
     return {"res_bits": out_bits, "flags": flags, "trace": trace}
 
 def fsub_f32(a_bits: Bits, b_bits: Bits) -> Dict[str, object]:
@@ -16,36 +16,27 @@ RISC-V semantics handled:
   - Quotient truncates toward zero; remainder has the sign of the dividend (signed ops).
 
 API:
-  mdu_div(op, rs1_bits, rs2_bits) -> { "q_bits", "r_bits", "overflow", "trace" }
+  mdu_div(op, rs1_bits, rs2_bits, trace=False) -> { "q_bits", "r_bits", "overflow", "trace" }
+  The per-step trace of the restoring loop is only built when trace=True.
 """
 
 from typing import Dict, Tuple
-from .bitvec import Bits, zero_bits, left_pad, twos_complement_negate, is_negative, bits_to_hex
-from .shifter import shifter
-from .alu import alu
+from .bitvec import Bits, zero_bits, left_pad, add_rca, twos_complement_negate, is_negative, bits_to_hex
+
+# Shared constant operands for the INT_MIN / -1 check (read-only; results copy them)
+_INT_MIN32 = [1] + [0]*31
+_NEG_ONE32 = [1]*32
 
 def _abs_bits(bits: Bits) -> Tuple[Bits, int]:
     if is_negative(bits):
         return twos_complement_negate(bits), 1
     return bits[:], 0
 
-def _is_zero(bits: Bits) -> bool:
-    return all(b == 0 for b in bits)
-
-def _eq_bits(a: Bits, b: Bits) -> bool:
-    if len(a) != len(b): return False
-    return all(x == y for x, y in zip(a, b))
-
-def _set_lsb(bits: Bits, val: int) -> Bits:
-    out = bits[:]
-    out[-1] = 1 if val else 0
-    return out
-
 def _hex32(bits: Bits) -> str:
     return bits_to_hex(bits)[-8:]
 
-def _restoring_div_unsigned(dividend_mag: Bits, divisor_mag: Bits):
-    """Unsigned restoring division. Returns (q_bits(32), r_bits(32), trace)."""
+def _restoring_div_unsigned(dividend_mag: Bits, divisor_mag: Bits, trace: bool = False):
+    """Unsigned restoring division. Returns (q_bits(32), r_bits(32), steps); steps is empty unless trace."""
     assert len(dividend_mag) == 32 and len(divisor_mag) == 32
 
     # 33-bit remainder 'r' (MSB acts as sign for subtraction result), 32-bit quotient 'q'
@@ -53,33 +44,62 @@ def _restoring_div_unsigned(dividend_mag: Bits, divisor_mag: Bits):
     q = dividend_mag[:]
     d33 = left_pad(divisor_mag, 33)
 
-    trace = []
+    # The subtrahend never changes: negate it once so each step is a single add
+    neg_d33 = twos_complement_negate(d33)
+
+    steps = []
     for step in range(32):
-        # Shift (r, q) left together
-        r = shifter(r, 1, "SLL")
-        r[-1] = q[0]            # bring down the next bit from q into r LSB
-        q = shifter(q, 1, "SLL")
-
-        # Try subtract: r - d33 using ALU on 33-bit vectors
-        r_try, _ = alu(r, d33, "SUB")  # r + (~d33 + 1)
-
-        if r_try[0] == 1:
-            # Negative -> restore, set q[LSB] = 0
-            q = _set_lsb(q, 0)
-            action = "RESTORE"
-        else:
-            # Accept subtraction, set q[LSB] = 1
+        # Shift (r, q) left together, bringing down the next bit from q into r LSB
+        r = r[1:] + q[:1]
+        q = q[1:] + [0]
+
+        # Try subtract: r - d33 = r + (~d33 + 1) on 33-bit vectors
+        r_try, _ = add_rca(r, neg_d33, 0)
+
+        # Negative -> restore, q[LSB] stays 0; otherwise accept subtraction, set q[LSB] = 1
+        accept = r_try[0] == 0
+        if accept:
             r = r_try
-            q = _set_lsb(q, 1)
-            action = "SUB"
+            q[-1] = 1
 
-        # Minimal trace: step + low 32 bits of r and full q
-        trace.append(f"step={step:02d} r=0x{_hex32(r[-32:])} q=0x{_hex32(q)} action={action}")
+        if trace:
+            # Minimal trace: step + low 32 bits of r and full q
+            action = "SUB" if accept else "RESTORE"
+            steps.append(f"step={step:02d} r=0x{_hex32(r[-32:])} q=0x{_hex32(q)} action={action}")
 
     # Final remainder is low 32 bits of r
-    return q, r[-32:], trace
+    return q, r[-32:], steps
+
+def _div_magnitudes(dividend_mag: Bits, divisor_mag: Bits) -> Tuple[Bits, Bits]:
+    """
+    Unsigned radix-4 restoring division without a trace. Returns (q_bits(32), r_bits(32)).
+    Each step brings down two dividend bits and picks the quotient digit by comparing the
+    partial remainder with 3d, 2d and d, so at most one subtraction is done per two bits.
+    """
+    # 35-bit operands: after bringing down two bits the remainder is below 4d < 2**34
+    d1 = left_pad(divisor_mag, 35)
+    d2 = d1[1:] + [0]
+    d3, _ = add_rca(d1, d2, 0)
+    multiples = ((d3, twos_complement_negate(d3), [1, 1]),
+                 (d2, twos_complement_negate(d2), [1, 0]),
+                 (d1, twos_complement_negate(d1), [0, 1]))
+
+    r = zero_bits(35)
+    q: Bits = []
+    for hi, lo in zip(dividend_mag[0::2], dividend_mag[1::2]):
+        r = r[2:] + [hi, lo]
+        # Equal-width MSB-first 0/1 lists compare lexicographically like unsigned values
+        for multiple, neg_multiple, digit in multiples:
+            if r >= multiple:
+                r, _ = add_rca(r, neg_multiple, 0)
+                q += digit
+                break
+        else:
+            q += [0, 0]
 
-def mdu_div(op: str, rs1_bits: Bits, rs2_bits: Bits) -> Dict[str, object]:
+    return q, r[-32:]
+
+def mdu_div(op: str, rs1_bits: Bits, rs2_bits: Bits, trace: bool = False) -> Dict[str, object]:
     if op not in ("DIV","DIVU","REM","REMU"):
         raise NotImplementedError(f"Unsupported op: {op}")
     if len(rs1_bits) != 32 or len(rs2_bits) != 32:
@@ -88,8 +108,8 @@ def mdu_div(op: str, rs1_bits: Bits, rs2_bits: Bits) -> Dict[str, object]:
     dividend = rs1_bits[:]
     divisor  = rs2_bits[:]
 
-    # Divide by zero
-    if _is_zero(divisor):
+    # Divide by zero (list membership and == below compare element-wise in C)
+    if 1 not in divisor:
         if op in ("DIV","DIVU"):
             # q = all 1s, r = dividend
             return {"q_bits": [1]*32, "r_bits": dividend, "overflow": 0, "trace": ["div_by_zero"]}
@@ -97,24 +117,26 @@ def mdu_div(op: str, rs1_bits: Bits, rs2_bits: Bits) -> Dict[str, object]:
             # remainder = dividend; quotient is not architecturally observed
             return {"q_bits": None, "r_bits": dividend, "overflow": 0, "trace": ["div_by_zero"]}
 
-    # Special INT_MIN / -1 case (signed DIV only)
-    INT_MIN = [1] + [0]*31
-    NEG_ONE = [1]*32
-    if op == "DIV" and _eq_bits(dividend, INT_MIN) and _eq_bits(divisor, NEG_ONE):
-        return {"q_bits": INT_MIN[:], "r_bits": zero_bits(32), "overflow": 1, "trace": ["int_min_div_minus1"]}
-    if op == "REM" and _eq_bits(dividend, INT_MIN) and _eq_bits(divisor, NEG_ONE):
+    # Special INT_MIN / -1 case (signed ops only)
+    if op in ("DIV","REM") and dividend == _INT_MIN32 and divisor == _NEG_ONE32:
+        if op == "DIV":
+            return {"q_bits": _INT_MIN32[:], "r_bits": zero_bits(32), "overflow": 1, "trace": ["int_min_div_minus1"]}
         return {"q_bits": None, "r_bits": zero_bits(32), "overflow": 0, "trace": ["int_min_div_minus1"]}
 
     # Prepare magnitudes
     if op in ("DIVU","REMU"):
-        a_mag, a_neg = dividend[:], 0
-        b_mag, b_neg = divisor[:],  0
+        a_mag, a_neg = dividend, 0
+        b_mag, b_neg = divisor,  0
     else:
         a_mag, a_neg = _abs_bits(dividend)
         b_mag, b_neg = _abs_bits(divisor)
 
-    # Core unsigned division
-    q_mag, r_mag, trace = _restoring_div_unsigned(a_mag, b_mag)
+    # Core unsigned division; the radix-2 loop is kept for its per-step trace
+    if trace:
+        q_mag, r_mag, steps = _restoring_div_unsigned(a_mag, b_mag, trace)
+    else:
+        q_mag, r_mag = _div_magnitudes(a_mag, b_mag)
+        steps = []
 
     # Apply signs for signed ops
     if op in ("DIVU","REMU"):
@@ -128,4 +150,4 @@ def mdu_div(op: str, rs1_bits: Bits, rs2_bits: Bits) -> Dict[str, object]:
         r_bits = r_mag[:] if r_neg == 0 else twos_complement_negate(r_mag)
         overflow = 0
 
-    return {"q_bits": q_bits, "r_bits": r_bits, "overflow": overflow, "trace": trace}
+    return {"q_bits": q_bits, "r_bits": r_bits, "overflow": overflow, "trace": steps}
@@ -14,138 +14,192 @@ Public API:
     zero_extend(bits, src_width, dst_width) -> list[0/1]
 """
 
+from functools import lru_cache
+from itertools import product
 from typing import List, Tuple, Dict, Union
 from .bitvec import Bits, zero_bits, add_rca, twos_complement_negate, bits_to_hex, bits_to_str
 
 # Utilities: bit parsing/normalization
 
+# ASCII digits '0'/'1' -> bit values 0/1, for bytes.translate
+_DIGITS_TO_BITS = bytes.maketrans(b"01", b"\x00\x01")
+_BIT_VALUES = frozenset((0, 1))
+
 def _bits_from_str_or_list(x: Union[str, List[int]]) -> Bits:
     if isinstance(x, list):
-        for b in x:
-            if b not in (0, 1):
-                raise ValueError("bits list must contain 0/1")
-        return [int(b) for b in x]
+        # issuperset checks every element in C; unhashable elements are not bits either
+        try:
+            valid = _BIT_VALUES.issuperset(x)
+        except TypeError:
+            valid = False
+        if not valid:
+            raise ValueError("bits list must contain 0/1")
+        return list(map(int, x))
     if isinstance(x, str):
         s = x.replace("_", "").strip()
-        if not s or any(ch not in "01" for ch in s):
+        # Anything left after stripping 0/1 from both ends is a non-bit character
+        if not s or s.strip("01"):
             raise ValueError("bits string must be only 0/1")
-        return [1 if ch == "1" else 0 for ch in s]
+        return list(s.encode().translate(_DIGITS_TO_BITS))
     raise TypeError("bits must be str or list[0/1]")
 
 def _pad_or_trim_32(bits: Bits) -> Bits:
-    if len(bits) > 32:
+    """Low 32 bits, zero-padded; a 32-bit input is returned as is (callers pass fresh lists)."""
+    n = len(bits)
+    if n == 32:
+        return bits
+    if n > 32:
         return bits[-32:]
-    if len(bits) < 32:
-        return [0] * (32 - len(bits)) + bits[:]
-    return bits[:]
+    return [0] * (32 - n) + bits
 
 # Decimal-string helpers
 
 def _strip_zeros(s: str) -> str:
-    i, n = 0, len(s)
-    while i < n - 1 and s[i] == '0':
-        i += 1
-    return s[i:]
+    # str.lstrip runs in C; an all-zero (or empty) string becomes '0'
+    return s.lstrip('0') or '0'
+
+# The digit tables are split by the incoming carry/remainder bit: _TABLE[bit][digit_char].
+# Indexing a tuple by the bit and a dict by the (pre-hashed) digit string avoids building
+# and hashing a tuple key per column.
 
 # multiply-by-2 table per digit with incoming carry (0/1) -> (out_digit_char, carry_out)
-_MUL2 = {
+_MUL2 = (
     # carry 0
-    ('0','0'):('0',0), ('1','0'):('2',0), ('2','0'):('4',0), ('3','0'):('6',0), ('4','0'):('8',0),
-    ('5','0'):('0',1), ('6','0'):('2',1), ('7','0'):('4',1), ('8','0'):('6',1), ('9','0'):('8',1),
+    {'0':('0',0), '1':('2',0), '2':('4',0), '3':('6',0), '4':('8',0),
+     '5':('0',1), '6':('2',1), '7':('4',1), '8':('6',1), '9':('8',1)},
     # carry 1  (means +1 from previous column)
-    ('0','1'):('1',0), ('1','1'):('3',0), ('2','1'):('5',0), ('3','1'):('7',0), ('4','1'):('9',0),
-    ('5','1'):('1',1), ('6','1'):('3',1), ('7','1'):('5',1), ('8','1'):('7',1), ('9','1'):('9',1),
-}
+    {'0':('1',0), '1':('3',0), '2':('5',0), '3':('7',0), '4':('9',0),
+     '5':('1',1), '6':('3',1), '7':('5',1), '8':('7',1), '9':('9',1)},
+)
 
 # division-by-2 per digit with incoming remainder r (0/1) -> (quot_digit_char, r_out)
-_DIV2 = {
+_DIV2 = (
     # r = 0
-    (0,'0'):('0',0), (0,'1'):('0',1), (0,'2'):('1',0), (0,'3'):('1',1), (0,'4'):('2',0),
-    (0,'5'):('2',1), (0,'6'):('3',0), (0,'7'):('3',1), (0,'8'):('4',0), (0,'9'):('4',1),
+    {'0':('0',0), '1':('0',1), '2':('1',0), '3':('1',1), '4':('2',0),
+     '5':('2',1), '6':('3',0), '7':('3',1), '8':('4',0), '9':('4',1)},
     # r = 1 (we had +10 from previous column)
-    (1,'0'):('5',0), (1,'1'):('5',1), (1,'2'):('6',0), (1,'3'):('6',1), (1,'4'):('7',0),
-    (1,'5'):('7',1), (1,'6'):('8',0), (1,'7'):('8',1), (1,'8'):('9',0), (1,'9'):('9',1),
-}
-
-# add carry (0/1) to a decimal digit -> (new_digit_char, new_carry)
-_ADD_CARRY = {
-    # carry 0: identity
-    ('0',0):('0',0), ('1',0):('1',0), ('2',0):('2',0), ('3',0):('3',0), ('4',0):('4',0),
-    ('5',0):('5',0), ('6',0):('6',0), ('7',0):('7',0), ('8',0):('8',0), ('9',0):('9',0),
-    # carry 1: increment with wrap
-    ('0',1):('1',0), ('1',1):('2',0), ('2',1):('3',0), ('3',1):('4',0), ('4',1):('5',0),
-    ('5',1):('6',0), ('6',1):('7',0), ('7',1):('8',0), ('8',1):('9',0), ('9',1):('0',1),
-}
+    {'0':('5',0), '1':('5',1), '2':('6',0), '3':('6',1), '4':('7',0),
+     '5':('7',1), '6':('8',0), '7':('8',1), '8':('9',0), '9':('9',1)},
+)
 
 def _dec_div2(dec: str) -> Tuple[str, int]:
     """Return (quotient_str, remainder_bit) for dec // 2 and dec % 2 using tables only."""
-    dec = _strip_zeros(dec)
     rem = 0
     out = []
     for ch in dec:
-        qd, rem = _DIV2[(rem, ch)]
+        qd, rem = _DIV2[rem][ch]
         out.append(qd)
     return _strip_zeros("".join(out)), rem
 
-def _dec_mul2(dec: str) -> str:
-    dec = _strip_zeros(dec)
-    carry = 0
-    out = []
-    for ch in reversed(dec):
-        od, carry = _MUL2[(ch, str(carry))]
-        out.append(od)
-    if carry == 1:
-        out.append('1')
-    return _strip_zeros("".join(reversed(out)))
-
-def _dec_add_small(dec: str, add_one: int) -> str:
-    """Add 0 or 1 to decimal string using carry table only."""
+def _dec_mul2(dec: str, add_one: int = 0) -> str:
+    """Return dec*2 + add_one (0/1) in one pass: add_one enters as the units carry (dec already stripped)."""
     carry = 1 if add_one == 1 else 0
     out = []
-    for ch in reversed(_strip_zeros(dec)):
-        od, carry = _ADD_CARRY[(ch, carry)]
+    for ch in reversed(dec):
+        od, carry = _MUL2[carry][ch]
         out.append(od)
     if carry == 1:
         out.append('1')
     return _strip_zeros("".join(reversed(out)))
 
-def _dec_compare(a: str, b: str) -> int:
-    """Return -1 if a<b, 0 if a==b, 1 if a>b for positive decimal strings."""
-    a = _strip_zeros(a); b = _strip_zeros(b)
-    if len(a) < len(b): return -1
-    if len(a) > len(b): return 1
-    if a == b: return 0
-    return -1 if a < b else 1
+# Range limits as (length, digits) keys: for decimal strings without leading zeros,
+# tuple order on (len, str) is numeric order, so one C-level compare does the range check
+_MAX_POS = '2147483647'
+_MAX_NEG_MAG = '2147483648'
+_MAX_POS_KEY = (len(_MAX_POS), _MAX_POS)
+_MAX_NEG_MAG_KEY = (len(_MAX_NEG_MAG), _MAX_NEG_MAG)
 
 # Conversions between decimal string and 32-bit Bits
 
+def _dec_div16(dec: str) -> Tuple[str, Tuple[int, int, int, int]]:
+    """Return (quotient_str, remainder nibble MSB-first) for dec // 16 and dec % 16 using _DIV16."""
+    rem = (0, 0, 0, 0)
+    out = []
+    for ch in dec:
+        qd, rem = _DIV16[rem][ch]
+        out.append(qd)
+    return _strip_zeros("".join(out)), rem
+
 def _dec_to_u32_bits(dec: str) -> Bits:
-    """Convert unsigned decimal string to 32-bit bit vector via repeated //2 and %2."""
+    """Convert unsigned decimal string to 32-bit bit vector (low 32 bits) via repeated //16 and %16."""
     q = _strip_zeros(dec)
     if q == '0':
         return [0]*32
-    bits_rev = []
-    # keep extracting remainders until quotient is zero
-    for _ in range(128):  # generous guard
-        q, r = _dec_div2(q)
-        bits_rev.append(r)
+    nibbles_rev = []
+    # The first 8 remainders are the low 32 bits; anything above them would be trimmed,
+    # so stop after 8 or once the quotient reaches zero
+    for _ in range(8):
+        q, nibble = _dec_div16(q)
+        nibbles_rev.append(nibble)
         if q == '0':
             break
-    bits = list(reversed(bits_rev))
+    bits = [b for nibble in reversed(nibbles_rev) for b in nibble]
     if len(bits) < 32:
         bits = [0]*(32 - len(bits)) + bits
-    elif len(bits) > 32:
-        bits = bits[-32:]
     return bits
 
 def _u32_bits_to_dec(bits: Bits) -> str:
     """Convert unsigned 32-bit bit vector to decimal string via *2 then +bit."""
     s = '0'
     for b in bits:
-        s = _dec_mul2(s)
-        if b == 1:
-            s = _dec_add_small(s, 1)
-    return _strip_zeros(s)
+        s = _dec_mul2(s, b)
+    return s
+
+def _build_div16() -> Dict[Tuple[int, int, int, int], Dict[str, Tuple[str, Tuple[int, int, int, int]]]]:
+    """
+    Division-by-16 per digit with incoming 4-bit remainder -> (quot_digit_char, rem_out),
+    derived from the //2 table: the column value is rem followed by the digit as a decimal string.
+    """
+    table = {}
+    for rem in product((0, 1), repeat=4):
+        rem_dec = _u32_bits_to_dec(list(rem))
+        row = table[rem] = {}
+        for ch in "0123456789":
+            q = rem_dec + ch
+            rem_rev = []
+            for _ in range(4):
+                q, r = _dec_div2(q)
+                rem_rev.append(r)
+            row[ch] = (q, tuple(reversed(rem_rev)))
+    return table
+
+# 16 rows of 10 entries, built once at import
+_DIV16 = _build_div16()
+
+# Conversions repeat the same small values (immediates, offsets); results are cached
+# per normalized input as tuples, and each call still gets its own dict
+_CACHE_SIZE = 4096
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _encode_dec(dec: str) -> Tuple[str, str, int]:
+    """(bin, hex, overflow) for a stripped decimal string with optional leading '-'."""
+    neg = dec.startswith('-')
+    mag = dec[1:] if neg else dec
+    if mag == '': mag = '0'
+    mag = _strip_zeros(mag)
+
+    # Range checks
+    limit = _MAX_NEG_MAG_KEY if neg else _MAX_POS_KEY
+    overflow = 1 if (len(mag), mag) > limit else 0
+
+    # Build 32-bit pattern (negation keeps the width, so no re-padding is needed)
+    mag_bits = _dec_to_u32_bits(mag)   # unsigned magnitude
+    bits32 = twos_complement_negate(mag_bits) if neg else mag_bits
+
+    # 32 bits -> exactly 8 hex digits
+    return bits_to_str(bits32), '0x' + bits_to_hex(bits32), overflow
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _decode_bits32(key: bytes) -> Tuple[str, int]:
+    """(value_str, sign) for 32 bits given as bytes of 0/1 (a hashable form of the list)."""
+    b = list(key)
+    if 1 not in b:
+        return '0', 0
+    if b[0] == 1:
+        mag = twos_complement_negate(b)
+        return '-' + _u32_bits_to_dec(mag), -1
+    else:
+        return _u32_bits_to_dec(b), +1
 
 # Public API
 
@@ -153,12 +207,15 @@ def sign_extend(bits: Bits, src_width: int, dst_width: int) -> Bits:
     if dst_width < src_width:
         return bits[-dst_width:]
     sign = bits[0] if len(bits) >= 1 else 0
-    return [sign]*(dst_width - src_width) + bits[-src_width:]
+    # The concatenation already builds a new list; only slice when bits is wider than src_width
+    src = bits if len(bits) == src_width else bits[-src_width:]
+    return [sign]*(dst_width - src_width) + src
 
 def zero_extend(bits: Bits, src_width: int, dst_width: int) -> Bits:
     if dst_width < src_width:
         return bits[-dst_width:]
-    return [0]*(dst_width - src_width) + bits[-src_width:]
+    src = bits if len(bits) == src_width else bits[-src_width:]
+    return [0]*(dst_width - src_width) + src
 
 def encode_twos_complement(value: Union[int, str]) -> Dict[str, Union[str, int]]:
     """Encode signed decimal value to 32-bit two's-complement.
@@ -172,30 +229,10 @@ def encode_twos_complement(value: Union[int, str]) -> Dict[str, Union[str, int]]
     else:
         raise TypeError("value must be int or decimal string")
 
-    neg = dec.startswith('-')
-    mag = dec[1:] if neg else dec
-    if mag == '': mag = '0'
-    mag = _strip_zeros(mag)
-
-    # Range checks
-    MAX_POS = '2147483647'
-    MAX_NEG_MAG = '2147483648'
-    overflow = 0
-    if neg:
-        if _dec_compare(mag, MAX_NEG_MAG) == 1:
-            overflow = 1
-    else:
-        if _dec_compare(mag, MAX_POS) == 1:
-            overflow = 1
-
-    # Build 32-bit pattern
-    mag_bits = _dec_to_u32_bits(mag)   # unsigned magnitude
-    bits32 = twos_complement_negate(mag_bits) if neg else mag_bits
-    bits32 = _pad_or_trim_32(bits32)
-
+    bin_str, hex_str, overflow = _encode_dec(dec)
     return {
-        'bin': bits_to_str(bits32),
-        'hex': '0x' + bits_to_hex(bits32)[-8:],
+        'bin': bin_str,
+        'hex': hex_str,
         'overflow': overflow,
     }
 
@@ -204,10 +241,5 @@ def decode_twos_complement(bits: Union[str, List[int]]) -> Dict[str, Union[str,
     Returns {'value_str': <decimal string>, 'sign': -1|0|+1}.
     """
     b = _pad_or_trim_32(_bits_from_str_or_list(bits))
-    if b == [0]*32:
-        return {'value_str': '0', 'sign': 0}
-    if b[0] == 1:
-        mag = twos_complement_negate(b)
-        return {'value_str': '-' + _u32_bits_to_dec(mag), 'sign': -1}
-    else:
-        return {'value_str': _u32_bits_to_dec(b), 'sign': +1}
+    value_str, sign = _decode_bits32(bytes(b))
+    return {'value_str': value_str, 'sign': sign}
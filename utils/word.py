@@ -0,0 +1,35 @@
+"""
+Packed 32-bit word helpers for the CPU core.
+
+The bit-vector modules in this package represent values as MSB-first lists of 0/1.
+The CPU core computes on native Python ints masked to 32 bits; these helpers are
+the conversion point between the two representations.
+"""
+
+from .bitvec import Bits
+
+Word = int  # unsigned 32-bit value held in a Python int, range [0, 2**32)
+
+WORD_MASK = 0xFFFFFFFF
+
+# Byte translations between bit values 0/1 and the ASCII digits b'0'/b'1'
+_BITS_TO_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+_DIGITS_TO_BITS = bytes.maketrans(b"01", b"\x00\x01")
+
+# Low-bit masks for widths 0..64, so unpacking indexes a table instead of shifting per call
+_WIDTH_MASKS = tuple((1 << w) - 1 for w in range(65))
+
+def bits_to_word(bits: Bits) -> Word:
+    """Pack an MSB-first bit list into an unsigned int."""
+    # bits -> bytes of 0/1 -> ASCII digits -> int, each step a single C call
+    return int(bytes(bits).translate(_BITS_TO_DIGITS), 2)
+
+def word_to_bits(word: Word, width: int = 32) -> Bits:
+    """Unpack the low 'width' bits of an int into an MSB-first bit list."""
+    mask = _WIDTH_MASKS[width] if width <= 64 else (1 << width) - 1
+    return list(format(word & mask, f"0{width}b").encode().translate(_DIGITS_TO_BITS))
+
+def word_to_signed(word: Word) -> int:
+    """Interpret a 32-bit word as a two's-complement signed int."""
+    # Branch-free: flipping the sign bit then subtracting it maps [2**31, 2**32) onto the negatives
+    return (word ^ 0x80000000) - 0x80000000